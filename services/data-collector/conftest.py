@@ -0,0 +1,3 @@
+"""
+pytest配置：将服务根目录加入导入路径，测试中可直接 import src
+"""
@@ -6,59 +6,126 @@
 
 import asyncio
 import time
-import ccxt
-import requests
+import aiohttp
+import ccxt.async_support as ccxt
+import orjson
+from aiolimiter import AsyncLimiter
 import hmac
 import hashlib
 import base64
 import urllib.parse
-from datetime import datetime
-from influxdb_client import InfluxDBClient, Point
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from influxdb_client import InfluxDBClient, WritePrecision
 from influxdb_client.client.write_api import SYNCHRONOUS
 from loguru import logger
 import yaml
 import sys
 
+from src.async_utils import IntervalTimer, TTLCache
+
+
+# 数据收集周期（秒）
+COLLECTION_INTERVAL = 30
+
+# 汇率缓存有效期（秒），稳定币汇率变化极小，无需每轮重新获取
+PRICE_CACHE_TTL = 60
+
+# 无法定价的资产在该时间内（秒）不再请求，过期后重新尝试
+UNPRICED_ASSET_TTL = 3600
+
+# HTX稳定币对USDT的行情交易对
+HTX_RATE_SYMBOLS = {
+    'USDC': 'usdcusdt',
+    'FDUSD': 'fdusdusdt',
+}
+
+# 各交易所REST请求速率上限（次/秒）
+HTX_REQUESTS_PER_SECOND = 8
+BINANCE_REQUESTS_PER_SECOND = 10
+
+# InfluxDB后台写入允许积压的最大批次数
+MAX_PENDING_WRITES = 4
+
+# HTX签名时间戳缓存 [秒, 格式化字符串]
+_htx_timestamp_cache = [0, ""]
+
+
+def _htx_timestamp():
+    """获取HTX签名用的UTC时间戳，同一秒内复用已格式化的字符串"""
+    now = int(time.time())
+    if now != _htx_timestamp_cache[0]:
+        _htx_timestamp_cache[0] = now
+        _htx_timestamp_cache[1] = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))
+    return _htx_timestamp_cache[1]
+
 
 class HTXApi:
     """HTX现货API直接调用类"""
-    def __init__(self, api_key, api_secret):
+    # 认证参数按字典序排列，无额外参数时无需再排序
+    _AUTH_KEYS_SORTED = ('AccessKeyId', 'SignatureMethod', 'SignatureVersion', 'Timestamp')
+    
+    # 连接类错误的重试次数和退避基数（秒）
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 0.2
+    
+    def __init__(self, api_key, api_secret, session):
         self.api_key = api_key
         self.api_secret = api_secret
+        self.session = session
         self.base_url = "https://api.huobi.pro"
+        self._limiter = AsyncLimiter(HTX_REQUESTS_PER_SECOND, 1)
+        
+        # 密钥不变，预先完成HMAC密钥初始化，签名时只需copy
+        self._hmac_template = hmac.new(api_secret.encode('utf-8'), digestmod=hashlib.sha256)
+        
+        # 固定不变的认证参数
+        self._base_auth_params = {
+            'AccessKeyId': api_key,
+            'SignatureMethod': 'HmacSHA256',
+            'SignatureVersion': '2',
+        }
     
     def _create_signature(self, method, endpoint, params):
         """创建API签名"""
-        timestamp = datetime.utcnow().isoformat()[0:19]
+        timestamp = _htx_timestamp()
         
         # 标准认证参数
-        auth_params = {
-            'AccessKeyId': self.api_key,
-            'SignatureMethod': 'HmacSHA256',
-            'SignatureVersion': '2',
-            'Timestamp': timestamp
-        }
+        auth_params = self._base_auth_params.copy()
+        auth_params['Timestamp'] = timestamp
         
-        # 合并所有参数并排序
-        all_params = dict(auth_params, **params)
-        sorted_params = sorted(all_params.items(), key=lambda x: x[0])
+        if params:
+            # 合并所有参数并排序
+            all_params = dict(auth_params, **params)
+            sorted_params = sorted(all_params.items(), key=lambda x: x[0])
+        else:
+            sorted_params = [(key, auth_params[key]) for key in self._AUTH_KEYS_SORTED]
         query_string = urllib.parse.urlencode(sorted_params)
         
         # 创建签名字符串 (注意换行符)
         pre_signed_text = f"{method}\napi.huobi.pro\n{endpoint}\n{query_string}"
         
         # 计算签名
-        signature = base64.b64encode(
-            hmac.new(
-                self.api_secret.encode('utf-8'),
-                pre_signed_text.encode('utf-8'),
-                hashlib.sha256
-            ).digest()
-        ).decode('utf-8')
+        h = self._hmac_template.copy()
+        h.update(pre_signed_text.encode('utf-8'))
+        signature = base64.b64encode(h.digest()).decode('utf-8')
         
         return signature, timestamp, auth_params
     
-    def get_account_id(self):
+    async def _get_json(self, url, params):
+        """通过共享会话发送GET请求，连接失败或超时时指数退避重试"""
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                async with self._limiter:
+                    async with self.session.get(url, params=params) as response:
+                        response.raise_for_status()
+                        return orjson.loads(await response.read())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.MAX_RETRIES:
+                    raise
+                await asyncio.sleep(self.RETRY_BACKOFF * (2 ** attempt))
+    
+    async def get_account_id(self):
         """获取现货账户ID"""
         try:
             endpoint = "/v1/account/accounts"
@@ -71,9 +138,7 @@ class HTXApi:
             
             url = f"{self.base_url}{endpoint}"
             
-            response = requests.get(url, params=final_params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get_json(url, final_params)
             
             if data.get('status') == 'ok':
                 for account in data.get('data', []):
@@ -87,17 +152,15 @@ class HTXApi:
             logger.error(f"Error getting HTX account ID: {e}")
             return None
     
-    def get_ticker_price(self, symbol):
-        """获取交易对价格 (使用公开API)"""
+    async def get_ticker_price(self, symbol):
+        """获取交易对价格 (使用公开API)，失败时返回None"""
         try:
             endpoint = f"/market/detail/merged"
             params = {'symbol': symbol.lower()}  # HTX使用小写
             
             url = f"{self.base_url}{endpoint}"
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get_json(url, params)
             
             if data.get('status') == 'ok':
                 tick = data.get('tick', {})
@@ -107,13 +170,13 @@ class HTXApi:
                     return float(close_price)
             
             logger.error(f"HTX ticker request failed for {symbol}: {data}")
-            return 1.0  # 如果获取失败，返回1.0避免计算错误
+            return None  # 获取失败返回None，由调用方决定兜底汇率
             
         except Exception as e:
             logger.error(f"Error getting HTX ticker for {symbol}: {e}")
-            return 1.0  # 如果获取失败，返回1.0避免计算错误
+            return None
 
-    def get_account_balance(self, account_id):
+    async def get_account_balance(self, account_id):
         """获取账户余额"""
         try:
             endpoint = f"/v1/account/accounts/{account_id}/balance"
@@ -126,31 +189,18 @@ class HTXApi:
             
             url = f"{self.base_url}{endpoint}"
             
-            response = requests.get(url, params=final_params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get_json(url, final_params)
             
             if data.get('status') == 'ok':
-                balances = {}
+                # 可用(trade)与冻结(frozen)余额直接累加为总余额
+                totals = defaultdict(float)
                 for item in data.get('data', {}).get('list', []):
-                    currency = item.get('currency', '').upper()
-                    balance_type = item.get('type', '')
-                    balance_value = float(item.get('balance', 0))
-                    
-                    if currency not in balances:
-                        balances[currency] = {'trade': 0, 'frozen': 0}
-                    
-                    if balance_type in ['trade', 'frozen']:
-                        balances[currency][balance_type] = balance_value
+                    if item.get('type') in ('trade', 'frozen'):
+                        balance_value = float(item.get('balance', 0))
+                        if balance_value:
+                            totals[item.get('currency', '').upper()] += balance_value
                 
-                # 计算总余额
-                total_balances = {}
-                for currency, types in balances.items():
-                    total = types['trade'] + types['frozen']
-                    if total > 0:
-                        total_balances[currency] = total
-                
-                return total_balances
+                return {currency: total for currency, total in totals.items() if total > 0}
             
             logger.error(f"HTX balance request failed: {data}")
             return {}
@@ -162,9 +212,17 @@ class HTXApi:
 
 class SimpleCollector:
     def __init__(self):
+        self.htx_api = None
+        self.htx_account_id = None
+        self._price_cache = TTLCache()
+        self._unpriced_assets = defaultdict(dict)  # 各交易所无法定价的资产 -> 过期时间，期间不再重复请求
+        # binance与binance2访问同一主机，共享限速
+        self._binance_limiter = AsyncLimiter(BINANCE_REQUESTS_PER_SECOND, 1)
+        # InfluxDB写入放到后台线程，不阻塞数据收集
+        self._write_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="influx-writer")
+        self._pending_writes = deque()
         self.load_config()
         self.setup_influxdb()
-        self.setup_exchanges()
         
     def load_config(self):
         """加载配置文件"""
@@ -185,10 +243,16 @@ class SimpleCollector:
         self.org = influx_config['organization']
         logger.info("InfluxDB connected")
     
-    def setup_exchanges(self):
+    async def setup_exchanges(self):
         """设置交易所连接"""
         self.exchanges = {}
         
+        # 共享HTTP会话，复用TCP/TLS连接
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=64, keepalive_timeout=75),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+        
         # Binance and Binance2
         for exchange_name in ['binance', 'binance2']:
             if exchange_name in self.config['exchanges'] and self.config['exchanges'][exchange_name]['enabled']:
@@ -208,10 +272,11 @@ class SimpleCollector:
             try:
                 self.htx_api = HTXApi(
                     self.config['exchanges']['htx']['api_key'],
-                    self.config['exchanges']['htx']['api_secret']
+                    self.config['exchanges']['htx']['api_secret'],
+                    self.session
                 )
                 # 获取现货账户ID
-                self.htx_account_id = self.htx_api.get_account_id()
+                self.htx_account_id = await self.htx_api.get_account_id()
                 if self.htx_account_id:
                     logger.info(f"HTX exchange initialized with account ID: {self.htx_account_id}")
                 else:
@@ -220,94 +285,173 @@ class SimpleCollector:
                 logger.error(f"Failed to initialize HTX: {e}")
                 self.htx_api = None
     
-    def get_account_balance_usdt(self, exchange_name, exchange=None):
+    async def close_exchanges(self):
+        """关闭交易所连接"""
+        for exchange_name, exchange in self.exchanges.items():
+            try:
+                await exchange.close()
+            except Exception as e:
+                logger.error(f"Error closing {exchange_name}: {e}")
+        
+        await self.session.close()
+    
+    async def _fetch_htx_rates(self, assets):
+        """并发获取HTX稳定币对USDT的汇率，获取失败的资产不在结果中"""
+        assets = [asset for asset in assets if asset in HTX_RATE_SYMBOLS]
+        rates = await asyncio.gather(*(
+            self._price_cache.get(
+                f"htx:{HTX_RATE_SYMBOLS[asset]}",
+                PRICE_CACHE_TTL,
+                lambda symbol=HTX_RATE_SYMBOLS[asset]: self.htx_api.get_ticker_price(symbol)
+            )
+            for asset in assets
+        ))
+        return {asset: rate for asset, rate in zip(assets, rates) if rate is not None}
+    
+    def _is_unpriced(self, exchange_name, asset):
+        """资产是否在无法定价名单中，过期的记录顺带移除"""
+        unpriced = self._unpriced_assets[exchange_name]
+        expires_at = unpriced.get(asset)
+        if expires_at is None:
+            return False
+        if time.monotonic() >= expires_at:
+            del unpriced[asset]
+            return False
+        return True
+    
+    def _mark_unpriced(self, exchange_name, asset):
+        """将资产加入无法定价名单，UNPRICED_ASSET_TTL后重新尝试"""
+        self._unpriced_assets[exchange_name][asset] = time.monotonic() + UNPRICED_ASSET_TTL
+    
+    async def _fetch_tickers(self, exchange_name, exchange, symbols):
+        """获取一批交易对的行情；整批被拒绝时逐个重试，只将被拒绝的交易对标记为无法定价"""
+        try:
+            async with self._binance_limiter:
+                return await exchange.fetch_tickers(symbols)
+        except ccxt.BadSymbol as e:
+            if len(symbols) == 1:
+                self._mark_unpriced(exchange_name, symbols[0].split('/')[0])
+                logger.warning(f"{exchange_name} rejected symbol {symbols[0]}: {e}")
+                return {}
+        
+        logger.warning(f"{exchange_name} rejected batch {symbols}, retrying symbols individually")
+        tickers = {}
+        for batch in await asyncio.gather(*(
+            self._fetch_tickers(exchange_name, exchange, [symbol]) for symbol in symbols
+        )):
+            tickers.update(batch)
+        return tickers
+    
+    async def _fetch_usdt_prices(self, exchange_name, exchange, assets):
+        """通过一次fetch_tickers批量获取资产对USDT的最新价格"""
+        await exchange.load_markets()
+        
+        symbols = []
+        for asset in assets:
+            symbol = f"{asset}/USDT"
+            if symbol in exchange.markets:
+                symbols.append(symbol)
+            else:
+                # 交易所不支持的交易对，一段时间内不再请求
+                self._mark_unpriced(exchange_name, asset)
+        
+        if not symbols:
+            return {}
+        
+        # 持仓中含BTC/ETH等波动资产，每轮都重新获取，不走汇率缓存
+        tickers = await self._fetch_tickers(exchange_name, exchange, symbols)
+        return {
+            symbol.split('/')[0]: ticker['last']
+            for symbol, ticker in tickers.items() if ticker.get('last')
+        }
+    
+    def _usdt_value(self, label, asset, amount, prices):
+        """USDT直接计入"""
+        logger.info(f"{label} {asset}: {amount} (added to USDT total)")
+        return amount
+    
+    def _stablecoin_value(self, label, asset, amount, prices):
+        """稳定币使用实时汇率，获取失败时按1:1计算"""
+        rate = prices.get(asset)
+        if rate is None:
+            logger.error(f"Failed to get {asset}/USDT rate, using 1:1")
+            return amount
+        asset_usdt_value = amount * rate
+        logger.info(f"{label} {asset}: {amount} * {rate} = {asset_usdt_value} USDT")
+        return asset_usdt_value
+    
+    def _other_asset_value(self, label, asset, amount, prices):
+        """其他资产按对USDT的价格计算，无法获取价格时忽略"""
+        if asset in prices:
+            asset_usdt_value = amount * prices[asset]
+            logger.info(f"{label} {asset}: {amount} * {prices[asset]} = {asset_usdt_value} USDT")
+            return asset_usdt_value
+        
+        if amount > 0.01:  # 只记录大于0.01的资产
+            logger.warning(f"{label} {asset}: {amount} (Could not get price)")
+        return 0.0
+    
+    # 按资产分派估值方法
+    _ASSET_HANDLERS = {
+        'USDT': _usdt_value,
+        'FDUSD': _stablecoin_value,
+        'USDC': _stablecoin_value,
+    }
+    
+    def _asset_value_usdt(self, label, asset, amount, prices):
+        """计算单个资产的USDT价值"""
+        handler = self._ASSET_HANDLERS.get(asset, SimpleCollector._other_asset_value)
+        return handler(self, label, asset, amount, prices)
+    
+    async def get_account_balance_usdt(self, exchange_name, exchange=None):
         """获取账户USDT总价值"""
         try:
             # HTX使用直接API调用
             if exchange_name == 'htx':
-                if not hasattr(self, 'htx_api') or not self.htx_api or not self.htx_account_id:
+                if self.htx_api is None or self.htx_account_id is None:
                     logger.error("HTX API not initialized")
                     return 0.0
                 
-                balance_data = self.htx_api.get_account_balance(self.htx_account_id)
+                balance_data = await self.htx_api.get_account_balance(self.htx_account_id)
                 if not balance_data:
                     return 0.0
                 
                 # 详细记录HTX账户资产
                 logger.info(f"HTX account assets: {balance_data}")
                 
-                total_usdt = 0.0
-                for asset, amount in balance_data.items():
-                    if amount > 0:
-                        if asset == 'USDT':
-                            total_usdt += amount
-                            logger.info(f"HTX {asset}: {amount} (added to USDT total)")
-                        elif asset == 'USDC':
-                            # 获取USDC/USDT实时汇率
-                            usdc_rate = self.htx_api.get_ticker_price('usdcusdt')
-                            usdc_usdt_value = amount * usdc_rate
-                            total_usdt += usdc_usdt_value
-                            logger.info(f"HTX {asset}: {amount} * {usdc_rate} = {usdc_usdt_value} USDT")
-                        elif asset == 'FDUSD':
-                            # 获取FDUSD/USDT实时汇率
-                            fdusd_rate = self.htx_api.get_ticker_price('fdusdusdt') 
-                            fdusd_usdt_value = amount * fdusd_rate
-                            total_usdt += fdusd_usdt_value
-                            logger.info(f"HTX {asset}: {amount} * {fdusd_rate} = {fdusd_usdt_value} USDT")
-                        else:
-                            # 其他资产，数量很小可以忽略
-                            if amount > 0.01:  # 只记录大于0.01的资产
-                                logger.warning(f"HTX {asset}: {amount} (NOT counted in USDT - needs conversion)")
+                # 并发获取各稳定币汇率
+                prices = await self._fetch_htx_rates(
+                    [asset for asset, amount in balance_data.items() if amount > 0]
+                )
+                total_usdt = sum(
+                    self._asset_value_usdt('HTX', asset, amount, prices)
+                    for asset, amount in balance_data.items() if amount > 0
+                )
                 
                 logger.info(f"HTX total USDT value: {total_usdt}")
                 return total_usdt
             
             else:
                 # 其他交易所使用CCXT
-                balance = exchange.fetch_balance()
-                total_usdt = 0.0
+                async with self._binance_limiter:
+                    balance = await exchange.fetch_balance()
+                held = {asset: amount for asset, amount in balance['total'].items() if amount > 0}
+                
+                # 一次请求获取所有持仓资产的USDT价格
+                try:
+                    prices = await self._fetch_usdt_prices(
+                        exchange_name,
+                        exchange,
+                        [asset for asset in held if asset != 'USDT' and not self._is_unpriced(exchange_name, asset)]
+                    )
+                except ccxt.BaseError as e:
+                    logger.error(f"Failed to fetch tickers from {exchange_name}: {e}")
+                    prices = {}
                 
-                # 计算所有资产的USDT价值
-                for asset, amount in balance['total'].items():
-                    if amount > 0:
-                        if asset == 'USDT':
-                            total_usdt += amount
-                            logger.info(f"Binance {asset}: {amount} (added to USDT total)")
-                        elif asset == 'FDUSD':
-                            # 获取FDUSD/USDT实时汇率
-                            try:
-                                fdusd_ticker = exchange.fetch_ticker('FDUSD/USDT')
-                                fdusd_rate = fdusd_ticker['last']
-                                fdusd_usdt_value = amount * fdusd_rate
-                                total_usdt += fdusd_usdt_value
-                                logger.info(f"Binance {asset}: {amount} * {fdusd_rate} = {fdusd_usdt_value} USDT")
-                            except Exception as e:
-                                logger.error(f"Failed to get FDUSD/USDT rate, using 1:1: {e}")
-                                total_usdt += amount
-                        elif asset == 'USDC':
-                            # 获取USDC/USDT实时汇率
-                            try:
-                                usdc_ticker = exchange.fetch_ticker('USDC/USDT')
-                                usdc_rate = usdc_ticker['last']
-                                usdc_usdt_value = amount * usdc_rate
-                                total_usdt += usdc_usdt_value
-                                logger.info(f"Binance {asset}: {amount} * {usdc_rate} = {usdc_usdt_value} USDT")
-                            except Exception as e:
-                                logger.error(f"Failed to get USDC/USDT rate, using 1:1: {e}")
-                                total_usdt += amount
-                        else:
-                            # 其他资产尝试获取对USDT的价格
-                            try:
-                                ticker_symbol = f"{asset}/USDT"
-                                ticker = exchange.fetch_ticker(ticker_symbol)
-                                asset_usdt_value = amount * ticker['last']
-                                total_usdt += asset_usdt_value
-                                logger.info(f"Binance {asset}: {amount} * {ticker['last']} = {asset_usdt_value} USDT")
-                            except:
-                                # 如果获取价格失败，忽略该资产
-                                if amount > 0.01:  # 只记录大于0.01的资产
-                                    logger.warning(f"Binance {asset}: {amount} (Could not get price)")
-                                pass
+                total_usdt = sum(
+                    self._asset_value_usdt('Binance', asset, amount, prices)
+                    for asset, amount in held.items()
+                )
                 
                 logger.info(f"Binance total USDT value: {total_usdt}")
                 return total_usdt
@@ -316,51 +460,97 @@ class SimpleCollector:
             logger.error(f"Error getting balance from {exchange_name}: {e}")
             return 0.0
     
-    def write_balance_to_influx(self, exchange_name, balance_usdt):
-        """写入余额数据到InfluxDB"""
+    def build_balance_line(self, exchange_name, balance_usdt, ts_ns):
+        """构建余额数据的line protocol（交易所名称由配置固定，无需转义）"""
+        return (
+            f"strategy_pnl,exchange={exchange_name},strategy=stablecoin_arbitrage "
+            f"total_value_usdt={float(balance_usdt)} {ts_ns}"
+        )
+    
+    def write_points_to_influx(self, lines):
+        """一次性写入本轮所有数据点到InfluxDB"""
         try:
-            point = Point("strategy_pnl") \
-                .tag("exchange", exchange_name) \
-                .tag("strategy", "stablecoin_arbitrage") \
-                .field("total_value_usdt", balance_usdt) \
-                .time(datetime.utcnow())
-            
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
-            logger.info(f"Written to InfluxDB: {exchange_name} = ${balance_usdt:.2f}")
+            self.write_api.write(
+                bucket=self.bucket,
+                org=self.org,
+                record=lines,
+                write_precision=WritePrecision.NS
+            )
+            logger.info(f"Written {len(lines)} points to InfluxDB")
             
         except Exception as e:
             logger.error(f"Error writing to InfluxDB: {e}")
     
-    def collect_once(self):
+    async def submit_points_to_influx(self, lines):
+        """提交到后台线程写入，积压过多时等待最早的写入完成"""
+        while self._pending_writes and self._pending_writes[0].done():
+            self._pending_writes.popleft()
+        
+        while len(self._pending_writes) >= MAX_PENDING_WRITES:
+            logger.warning("InfluxDB writes backlogged, waiting for pending writes")
+            await self._pending_writes.popleft()
+        
+        loop = asyncio.get_running_loop()
+        self._pending_writes.append(
+            loop.run_in_executor(self._write_pool, self.write_points_to_influx, lines)
+        )
+    
+    async def flush_writes(self):
+        """等待所有后台写入完成并关闭写入线程池"""
+        while self._pending_writes:
+            await self._pending_writes.popleft()
+        self._write_pool.shutdown()
+    
+    async def collect_once(self):
         """执行一次数据收集"""
-        # 处理CCXT交易所
-        for exchange_name, exchange in self.exchanges.items():
-            balance_usdt = self.get_account_balance_usdt(exchange_name, exchange)
-            if balance_usdt > 0:
-                self.write_balance_to_influx(exchange_name, balance_usdt)
+        # CCXT交易所
+        exchange_names = list(self.exchanges)
+        tasks = [
+            self.get_account_balance_usdt(exchange_name, exchange)
+            for exchange_name, exchange in self.exchanges.items()
+        ]
+        
+        # HTX直接API
+        if self.htx_api is not None and self.htx_account_id is not None:
+            exchange_names.append('htx')
+            tasks.append(self.get_account_balance_usdt('htx'))
         
-        # 处理HTX直接API
-        if hasattr(self, 'htx_api') and self.htx_api and self.htx_account_id:
-            balance_usdt = self.get_account_balance_usdt('htx')
+        # 所有交易所并发请求
+        results = await asyncio.gather(*tasks)
+        
+        # 本轮所有数据点使用同一时间戳
+        ts_ns = time.time_ns()
+        lines = []
+        for exchange_name, balance_usdt in zip(exchange_names, results):
             if balance_usdt > 0:
-                self.write_balance_to_influx('htx', balance_usdt)
+                lines.append(self.build_balance_line(exchange_name, balance_usdt, ts_ns))
+                logger.info(f"Collected {exchange_name} = ${balance_usdt:.2f}")
+        
+        # 合并为单次HTTP写入
+        if lines:
+            await self.submit_points_to_influx(lines)
     
-    def run(self):
+    async def run(self):
         """主运行循环"""
         logger.info("Starting SCOA simple data collector")
+        await self.setup_exchanges()
         
+        timer = IntervalTimer(COLLECTION_INTERVAL)
         while True:
             try:
-                self.collect_once()
-                logger.info("Collection completed, sleeping 30 seconds...")
-                time.sleep(30)
-            except KeyboardInterrupt:
+                try:
+                    await self.collect_once()
+                    logger.info("Collection completed")
+                except Exception as e:
+                    logger.error(f"Collection error: {e}")
+                
+                await timer.wait()
+            except asyncio.CancelledError:
                 logger.info("Stopping collector...")
                 break
-            except Exception as e:
-                logger.error(f"Collection error: {e}")
-                time.sleep(30)
         
+        await self.close_exchanges()
+        await self.flush_writes()
         self.influx_client.close()
         logger.info("Collector stopped")
 
@@ -371,4 +561,7 @@ if __name__ == "__main__":
     logger.add(sys.stderr, level="INFO", format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {message}")
     
     collector = SimpleCollector()
-    collector.run()
\ No newline at end of file
+    try:
+        asyncio.run(collector.run())
+    except KeyboardInterrupt:
+        pass
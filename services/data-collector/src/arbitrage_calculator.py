@@ -3,9 +3,11 @@
 计算FDUSD/USDT vs USDC/USDT的价差和套利机会
 """
 
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
-from dataclasses import dataclass
+import bisect
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from dataclasses import dataclass, fields
+import numpy as np
 from loguru import logger
 
 
@@ -34,6 +36,70 @@ class PnLData:
     cumulative_pnl_percent: float
 
 
+class HistoryStore:
+    """
+    按列存储的历史记录
+    float字段保存在连续的NumPy数组中，其余字段保存在列表中
+    """
+    
+    def __init__(self, record_cls, capacity: int = 64):
+        self.record_cls = record_cls
+        self._capacity = capacity
+        self._size = 0
+        self._arrays = {
+            f.name: np.empty(capacity, dtype=np.float64)
+            for f in fields(record_cls) if f.type is float
+        }
+        self._lists = {
+            f.name: []
+            for f in fields(record_cls) if f.type is not float
+        }
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._record(i)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(self._size))]
+        
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("history index out of range")
+        return self._record(index)
+    
+    def append(self, record):
+        """追加一条记录，容量不足时按倍数扩容"""
+        if self._size == self._capacity:
+            self._capacity *= 2
+            for name, array in self._arrays.items():
+                grown = np.empty(self._capacity, dtype=np.float64)
+                grown[:self._size] = array[:self._size]
+                self._arrays[name] = grown
+        
+        for name, array in self._arrays.items():
+            array[self._size] = getattr(record, name)
+        for name, values in self._lists.items():
+            values.append(getattr(record, name))
+        self._size += 1
+    
+    def column(self, name: str):
+        """获取某个字段的全部数据（float字段返回NumPy数组视图）"""
+        if name in self._arrays:
+            return self._arrays[name][:self._size]
+        return self._lists[name]
+    
+    def _record(self, i: int):
+        values: Dict[str, Any] = {name: float(array[i]) for name, array in self._arrays.items()}
+        for name, column in self._lists.items():
+            values[name] = column[i]
+        return self.record_cls(**values)
+
+
 class ArbitrageCalculator:
     """稳定币套利计算器"""
     
@@ -41,8 +107,8 @@ class ArbitrageCalculator:
         self.initial_capital = initial_capital
         self.transaction_fee = 0.001  # 0.1% 手续费
         self.min_profit_threshold = 0.05  # 最小5个基点才考虑套利
-        self.price_history = []
-        self.pnl_history = []
+        self.price_history = HistoryStore(ArbitrageOpportunity)
+        self.pnl_history = HistoryStore(PnLData)
         
     def calculate_arbitrage_opportunity(
         self, 
@@ -132,22 +198,21 @@ class ArbitrageCalculator:
         prices: Dict[str, float]
     ) -> float:
         """计算账户总USDT价值"""
+        # 各稳定币对USDT的价格在循环外查好，FDUSD/USDC默认1:1
+        stable_prices = {
+            'USDT': 1.0,
+            'FDUSD': prices.get('fdusd_usdt', 1.0),
+            'USDC': prices.get('usdc_usdt', 1.0),
+        }
         total_value = 0.0
         
         for asset, amount in balance.items():
             if amount <= 0:
                 continue
-                
-            if asset.upper() == 'USDT':
-                total_value += amount
-            elif asset.upper() == 'FDUSD':
-                # FDUSD按其对USDT的价格计算
-                fdusd_price = prices.get('fdusd_usdt', 1.0)  # 默认1:1
-                total_value += amount * fdusd_price
-            elif asset.upper() == 'USDC':
-                # USDC按其对USDT的价格计算
-                usdc_price = prices.get('usdc_usdt', 1.0)  # 默认1:1
-                total_value += amount * usdc_price
+            
+            price = stable_prices.get(asset.upper())
+            if price is not None:
+                total_value += amount * price
             else:
                 # 其他资产忽略或按特定价格计算
                 logger.debug(f"Unknown asset for valuation: {asset}")
@@ -156,23 +221,19 @@ class ArbitrageCalculator:
     
     def get_recent_opportunities(self, hours: int = 24) -> List[ArbitrageOpportunity]:
         """获取最近的套利机会"""
-        cutoff_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        cutoff_time = cutoff_time.replace(hour=cutoff_time.hour - hours)
+        cutoff_time = datetime.now() - timedelta(hours=hours)
         
-        return [
-            opp for opp in self.price_history 
-            if opp.timestamp >= cutoff_time
-        ]
+        # 记录按时间顺序追加，二分查找起始位置
+        start = bisect.bisect_left(self.price_history.column('timestamp'), cutoff_time)
+        return self.price_history[start:]
     
     def get_recent_pnl(self, days: int = 30) -> List[PnLData]:
         """获取最近的PnL数据"""
         cutoff_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        cutoff_time = cutoff_time.replace(day=cutoff_time.day - days)
+        cutoff_time = cutoff_time - timedelta(days=days)
         
-        return [
-            pnl for pnl in self.pnl_history 
-            if pnl.timestamp >= cutoff_time
-        ]
+        start = bisect.bisect_left(self.pnl_history.column('timestamp'), cutoff_time)
+        return self.pnl_history[start:]
     
     def get_performance_stats(self) -> Dict[str, float]:
         """获取策略表现统计"""
@@ -181,32 +242,23 @@ class ArbitrageCalculator:
             
         latest_pnl = self.pnl_history[-1]
         
-        # 计算最大回撤
-        max_value = self.initial_capital
-        max_drawdown = 0.0
+        total_values = self.pnl_history.column('total_value_usdt')
         
-        for pnl in self.pnl_history:
-            max_value = max(max_value, pnl.total_value_usdt)
-            drawdown = (max_value - pnl.total_value_usdt) / max_value * 100
-            max_drawdown = max(max_drawdown, drawdown)
+        # 计算最大回撤
+        peaks = np.maximum(np.maximum.accumulate(total_values), self.initial_capital)
+        max_drawdown = float(((peaks - total_values) / peaks).max() * 100)
         
         # 计算年化收益率（假设）
-        days_running = max(1, (datetime.now() - self.pnl_history[0].timestamp).days)
+        days_running = max(1, (datetime.now() - self.pnl_history.column('timestamp')[0]).days)
         annualized_return = (latest_pnl.cumulative_pnl_percent / days_running) * 365
         
         # 计算夏普比率（简化版）
-        daily_returns = []
-        for i in range(1, len(self.pnl_history)):
-            prev_value = self.pnl_history[i-1].total_value_usdt
-            curr_value = self.pnl_history[i].total_value_usdt
-            daily_return = (curr_value - prev_value) / prev_value
-            daily_returns.append(daily_return)
-        
-        if daily_returns:
-            import statistics
-            avg_return = statistics.mean(daily_returns) * 365
-            return_std = statistics.stdev(daily_returns) * (365 ** 0.5) if len(daily_returns) > 1 else 0
-            sharpe_ratio = avg_return / return_std if return_std > 0 else 0
+        daily_returns = np.diff(total_values) / total_values[:-1]
+        
+        if daily_returns.size:
+            avg_return = daily_returns.mean() * 365
+            return_std = daily_returns.std(ddof=1) * np.sqrt(365) if daily_returns.size > 1 else 0
+            sharpe_ratio = float(avg_return / return_std) if return_std > 0 else 0
         else:
             sharpe_ratio = 0
             
@@ -0,0 +1,62 @@
+"""
+异步工具模块
+提供采集服务共用的结果缓存与周期调度
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """带TTL的异步结果缓存
+    
+    同一key的并发请求只实际发起一次；获取失败（抛出异常或返回None）的结果不缓存
+    """
+    
+    def __init__(self):
+        # key -> (写入时间, 结果)
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        # 进行中的请求：key -> Future，相同请求并发时共享结果
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+    
+    async def single_flight(self, key: Hashable, fetch_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """合并同一key的并发请求，只有第一个调用者实际发起请求"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch_fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield：单个调用者被取消时不影响其他等待同一结果的调用者
+        return await asyncio.shield(future)
+    
+    async def get(self, key: Hashable, ttl: float, fetch_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """返回未过期的缓存结果，否则请求并写入缓存"""
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        
+        async def fetch_and_store() -> Any:
+            value = await fetch_fn()
+            if value is not None:
+                self._entries[key] = (time.monotonic(), value)
+            return value
+        
+        return await self.single_flight(key, fetch_and_store)
+
+
+class IntervalTimer:
+    """按单调时钟的截止时间调度周期任务，任务耗时不累积到周期中"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._deadline = time.monotonic() + interval
+    
+    async def wait(self) -> None:
+        """等待到下一个周期的截止时间"""
+        now = time.monotonic()
+        if self._deadline < now - self.interval:
+            # 落后超过一个周期时重新对齐，避免连续补跑
+            self._deadline = now
+        await asyncio.sleep(max(0.0, self._deadline - now))
+        self._deadline += self.interval
@@ -5,10 +5,14 @@
 
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from loguru import logger
 
 
+# 优先使用libyaml的C实现解析
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 class Config:
     def __init__(self, config_path: Optional[str] = None):
         if config_path is None:
@@ -17,6 +21,8 @@ class Config:
         
         self.config_path = Path(config_path)
         self.config_data = {}
+        self._cache: Dict[str, Any] = {}
+        self._enabled_exchanges: Tuple[str, ...] = ()
         self.load_config()
     
     def load_config(self):
@@ -25,8 +31,16 @@ class Config:
             if not self.config_path.exists():
                 raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
             
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config_data = yaml.safe_load(f)
+            self.config_data = self._load_parsed()
+            
+            # 预先展开所有点分路径，并缓存常用配置
+            self._cache = {}
+            self._flatten(self.config_data, "")
+            self._enabled_exchanges = tuple(
+                name for name, config in (self.get_exchanges_config() or {}).items()
+                if config.get("enabled", False)
+            )
+            self._materialize()
             
             logger.info(f"Configuration loaded from: {self.config_path}")
             
@@ -34,20 +48,37 @@ class Config:
             logger.error(f"Failed to load configuration: {e}")
             raise
     
+    def _load_parsed(self) -> Any:
+        """读取并解析YAML配置文件"""
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            return yaml.load(f, Loader=_YamlLoader)
+    
+    def _flatten(self, data: Any, prefix: str):
+        """递归展开配置，以完整点分路径为键写入缓存"""
+        if not isinstance(data, dict):
+            return
+        
+        for key, value in data.items():
+            key_path = f"{prefix}{key}"
+            self._cache[key_path] = value
+            self._flatten(value, f"{key_path}.")
+    
+    def _materialize(self):
+        """将热路径上使用的配置预先计算为属性"""
+        self.influxdb_url = self.get_influxdb_url()
+        self.influxdb_token = self.get_influxdb_token()
+        self.influxdb_org = self.get_influxdb_org()
+        self.influxdb_bucket = self.get_influxdb_bucket()
+        self.collection_interval_s = self.get_collection_interval() * 60
+        self.concurrent_requests = self.get_concurrent_requests()
+        self.enabled_exchanges = self.get_enabled_exchanges()
+    
     def get(self, key_path: str, default: Any = None) -> Any:
         """
         通过点分路径获取配置值
         例: get("app.name") -> config_data["app"]["name"]
         """
-        keys = key_path.split('.')
-        value = self.config_data
-        
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default
+        return self._cache.get(key_path, default)
     
     # App配置
     def get_app_name(self) -> str:
@@ -108,18 +139,11 @@ class Config:
         return self.get(f"exchanges.{exchange_name}")
     
     def is_exchange_enabled(self, exchange_name: str) -> bool:
-        exchange_config = self.get_exchange_config(exchange_name)
-        if exchange_config:
-            return exchange_config.get("enabled", False)
-        return False
-    
-    def get_enabled_exchanges(self) -> list:
-        """获取所有启用的交易所列表"""
-        exchanges = []
-        for exchange_name, config in self.get_exchanges_config().items():
-            if config.get("enabled", False):
-                exchanges.append(exchange_name)
-        return exchanges
+        return exchange_name in self._enabled_exchanges
+    
+    def get_enabled_exchanges(self) -> Tuple[str, ...]:
+        """获取所有启用的交易所列表（加载配置时已计算）"""
+        return self._enabled_exchanges
     
     # 性能配置
     def get_max_workers(self) -> int:
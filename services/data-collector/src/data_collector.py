@@ -5,16 +5,58 @@
 
 import asyncio
 import time
-from typing import Dict, List, Optional
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Type
 from datetime import datetime, timedelta
 from loguru import logger
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 from .config import Config
 from .database import InfluxDBManager
 from .exchanges.binance_exchange import BinanceExchange
 from .exchanges.htx_exchange import HTXExchange
 from .exchanges.base_exchange import BaseExchange
 from .arbitrage_calculator import ArbitrageCalculator
+from .async_utils import IntervalTimer
+
+
+# 交易所名称到适配器类的映射
+_EXCHANGE_CLASSES: Dict[str, Type[BaseExchange]] = {
+    'binance': BinanceExchange,
+    'htx': HTXExchange,
+}
+
+
+# 健康指标变化阈值：计数器变化1次、内存变化1MB、运行时间变化1秒以内视为未变化
+HEALTH_METRIC_EPSILON = 1.0
+
+
+@dataclass(slots=True)
+class CollectorStats:
+    """收集器统计信息"""
+    collections_completed: int = 0
+    collections_failed: int = 0
+    last_collection_time: Optional[datetime] = None
+    total_runtime: float = 0.0
+    start_time: Optional[datetime] = None
+
+
+async def _count_successful(named_coros) -> int:
+    """并发执行协程，返回结果为True的数量；单个协程出错时记录异常并按失败计数，不影响其他协程"""
+    
+    async def run(name, coro) -> bool:
+        try:
+            return await coro is True
+        except Exception:
+            logger.exception("Task {} failed", name)
+            return False
+    
+    results = await asyncio.gather(*(run(name, coro) for name, coro in named_coros))
+    return sum(results)
 
 
 class DataCollector:
@@ -27,25 +69,31 @@ class DataCollector:
         self.running = False
         
         # 收集任务配置
-        self.collection_interval = self.config.get_collection_interval() * 60  # 转换为秒
-        self.concurrent_requests = self.config.get_concurrent_requests()
+        self.collection_interval = self.config.collection_interval_s
+        self.concurrent_requests = self.config.concurrent_requests
+        
+        # 限制同时进行的交易所API请求数量
+        self._api_sem = asyncio.Semaphore(self.concurrent_requests)
+        
+        # 当前进程句柄，用于内存统计（psutil为可选依赖）
+        self._proc = psutil.Process() if psutil else None
+        
+        # 本轮各交易所已获取的投资组合数据，供策略PnL复用
+        self._round_portfolios: Dict[str, Dict] = {}
+        
+        # 上次写入的健康指标，未变化的指标不重复写入
+        self._last_health: Dict[str, float] = {}
         
         # 初始化套利计算器
         self.arbitrage_calculator = ArbitrageCalculator()
         
         # 统计信息
-        self.stats = {
-            'collections_completed': 0,
-            'collections_failed': 0,
-            'last_collection_time': None,
-            'total_runtime': 0,
-            'start_time': None
-        }
+        self.stats = CollectorStats()
     
     async def initialize(self):
         """初始化所有交易所连接"""
         try:
-            enabled_exchanges = self.config.get_enabled_exchanges()
+            enabled_exchanges = self.config.enabled_exchanges
             logger.info(f"Initializing exchanges: {enabled_exchanges}")
             
             for exchange_name in enabled_exchanges:
@@ -74,13 +122,11 @@ class DataCollector:
     async def _create_exchange(self, exchange_name: str, config: Dict) -> Optional[BaseExchange]:
         """创建交易所实例"""
         try:
-            if exchange_name.lower() == 'binance':
-                return BinanceExchange(config)
-            elif exchange_name.lower() == 'htx':
-                return HTXExchange(config)
-            else:
+            exchange_cls = _EXCHANGE_CLASSES.get(exchange_name.lower())
+            if exchange_cls is None:
                 logger.warning(f"Unknown exchange type: {exchange_name}")
                 return None
+            return exchange_cls(config)
                 
         except Exception as e:
             logger.error(f"Failed to create exchange {exchange_name}: {e}")
@@ -89,7 +135,8 @@ class DataCollector:
     async def start(self):
         """启动数据收集服务"""
         self.running = True
-        self.stats['start_time'] = datetime.now()
+        self.stats.start_time = datetime.now()
+        start_monotonic = time.monotonic()
         
         logger.info(f"Starting data collection with {self.collection_interval}s interval")
         
@@ -97,22 +144,24 @@ class DataCollector:
         health_task = asyncio.create_task(self._health_check_loop())
         
         try:
+            timer = IntervalTimer(self.collection_interval)
             while self.running:
-                collection_start = time.time()
+                collection_start = time.monotonic()
                 
                 # 执行数据收集
                 await self._collect_data_round()
                 
-                # 更新统计信息
-                collection_time = time.time() - collection_start
-                self.stats['last_collection_time'] = datetime.now()
-                self.stats['total_runtime'] = time.time() - self.stats['start_time'].timestamp()
+                # 更新统计信息（耗时使用单调时钟，不受系统时间调整影响）
+                now = time.monotonic()
+                collection_time = now - collection_start
+                self.stats.last_collection_time = datetime.now()
+                self.stats.total_runtime = now - start_monotonic
                 
                 logger.info(f"Data collection completed in {collection_time:.2f}s")
                 
                 # 等待下一个收集周期
                 if self.running:
-                    await asyncio.sleep(self.collection_interval)
+                    await timer.wait()
                     
         except Exception as e:
             logger.error(f"Error in data collection loop: {e}")
@@ -123,62 +172,67 @@ class DataCollector:
     async def _collect_data_round(self):
         """执行一轮数据收集"""
         try:
-            # 并发收集所有交易所数据
-            tasks = []
-            for exchange_name, exchange in self.exchanges.items():
-                task = asyncio.create_task(
-                    self._collect_exchange_data(exchange_name, exchange),
-                    name=f"collect_{exchange_name}"
-                )
-                tasks.append(task)
+            # 本轮所有数据点，最后一次性写入，汇总类数据点共用同一纳秒时间戳
+            round_points: List[str] = []
+            round_ts_ns = time.time_ns()
+            self._round_portfolios = {}
             
-            # 等待所有任务完成
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # 并发收集所有交易所数据并统计结果
+            successful = await _count_successful(
+                (f"collect_{exchange_name}", self._collect_exchange_data(exchange_name, exchange, round_points, round_ts_ns))
+                for exchange_name, exchange in self.exchanges.items()
+            )
+            failed = len(self.exchanges) - successful
             
-            # 统计结果
-            successful = sum(1 for result in results if result is True)
-            failed = len(results) - successful
-            
-            self.stats['collections_completed'] += successful
-            self.stats['collections_failed'] += failed
+            self.stats.collections_completed += successful
+            self.stats.collections_failed += failed
             
             if failed > 0:
                 logger.warning(f"Collection round completed: {successful} successful, {failed} failed")
             else:
                 logger.info(f"Collection round completed: {successful} exchanges processed successfully")
             
-            # 收集套利策略PnL数据
-            await self._collect_strategy_pnl()
+            # 收集套利策略PnL数据（复用本轮已获取的投资组合数据）
+            self._collect_strategy_pnl(round_points, round_ts_ns)
+            
+            # 合并为一次InfluxDB写入
+            await self.db_manager.write_points(round_points)
                 
         except Exception as e:
             logger.error(f"Error in data collection round: {e}")
-            self.stats['collections_failed'] += 1
+            self.stats.collections_failed += 1
     
-    async def _collect_exchange_data(self, exchange_name: str, exchange: BaseExchange) -> bool:
+    async def _collect_exchange_data(
+        self,
+        exchange_name: str,
+        exchange: BaseExchange,
+        round_points: List[str],
+        round_ts_ns: int
+    ) -> bool:
         """收集单个交易所的数据"""
         try:
             if not exchange.is_enabled():
                 logger.warning(f"Exchange {exchange_name} is not enabled")
                 return False
             
-            logger.debug(f"Collecting data from {exchange_name}")
+            logger.debug("Collecting data from {}", exchange_name)
             
             # 并发收集不同类型的数据
-            tasks = [
-                self._collect_balance_data(exchange_name, exchange),
-                self._collect_market_data(exchange_name, exchange),
-                self._collect_trade_data(exchange_name, exchange),
-                self._collect_portfolio_data(exchange_name, exchange),
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            collectors = {
+                'balance': self._collect_balance_data(exchange_name, exchange, round_points),
+                'market': self._collect_market_data(exchange_name, exchange, round_points),
+                'trade': self._collect_trade_data(exchange_name, exchange, round_points),
+                'portfolio': self._collect_portfolio_data(exchange_name, exchange, round_points, round_ts_ns),
+            }
             
-            # 检查结果
-            successful = sum(1 for result in results if result is True)
-            total = len(results)
+            successful = await _count_successful(
+                (f"collect_{exchange_name}_{data_type}", coro)
+                for data_type, coro in collectors.items()
+            )
+            total = len(collectors)
             
             if successful == total:
-                logger.debug(f"Successfully collected all data types from {exchange_name}")
+                logger.debug("Successfully collected all data types from {}", exchange_name)
                 return True
             else:
                 logger.warning(f"Partial success for {exchange_name}: {successful}/{total} data types collected")
@@ -188,13 +242,14 @@ class DataCollector:
             logger.error(f"Failed to collect data from {exchange_name}: {e}")
             return False
     
-    async def _collect_balance_data(self, exchange_name: str, exchange: BaseExchange) -> bool:
+    async def _collect_balance_data(self, exchange_name: str, exchange: BaseExchange, round_points: List[str]) -> bool:
         """收集余额数据"""
         try:
-            balances = await exchange.get_account_balance()
+            async with self._api_sem:
+                balances = await exchange.get_account_balance()
             if balances:
-                await self.db_manager.write_balances(exchange_name, balances)
-                logger.debug(f"Collected {len(balances)} balance records from {exchange_name}")
+                round_points.extend(self.db_manager.build_balance_points(exchange_name, balances))
+                logger.debug("Collected {} balance records from {}", len(balances), exchange_name)
                 return True
             return False
             
@@ -202,13 +257,14 @@ class DataCollector:
             logger.error(f"Failed to collect balance data from {exchange_name}: {e}")
             return False
     
-    async def _collect_market_data(self, exchange_name: str, exchange: BaseExchange) -> bool:
+    async def _collect_market_data(self, exchange_name: str, exchange: BaseExchange, round_points: List[str]) -> bool:
         """收集市场数据"""
         try:
-            market_data = await exchange.get_market_data()
+            async with self._api_sem:
+                market_data = await exchange.get_market_data()
             if market_data:
-                await self.db_manager.write_market_data(exchange_name, market_data)
-                logger.debug(f"Collected market data for {len(market_data)} symbols from {exchange_name}")
+                round_points.extend(self.db_manager.build_market_data_points(exchange_name, market_data))
+                logger.debug("Collected market data for {} symbols from {}", len(market_data), exchange_name)
                 return True
             return False
             
@@ -216,13 +272,14 @@ class DataCollector:
             logger.error(f"Failed to collect market data from {exchange_name}: {e}")
             return False
     
-    async def _collect_trade_data(self, exchange_name: str, exchange: BaseExchange) -> bool:
+    async def _collect_trade_data(self, exchange_name: str, exchange: BaseExchange, round_points: List[str]) -> bool:
         """收集交易数据"""
         try:
-            trades = await exchange.get_recent_trades(limit=50)
+            async with self._api_sem:
+                trades = await exchange.get_recent_trades(limit=50)
             if trades:
-                await self.db_manager.write_trades(exchange_name, trades)
-                logger.debug(f"Collected {len(trades)} trade records from {exchange_name}")
+                round_points.extend(self.db_manager.build_trade_points(exchange_name, trades))
+                logger.debug("Collected {} trade records from {}", len(trades), exchange_name)
                 return True
             return False
             
@@ -230,13 +287,21 @@ class DataCollector:
             logger.error(f"Failed to collect trade data from {exchange_name}: {e}")
             return False
     
-    async def _collect_portfolio_data(self, exchange_name: str, exchange: BaseExchange) -> bool:
+    async def _collect_portfolio_data(
+        self,
+        exchange_name: str,
+        exchange: BaseExchange,
+        round_points: List[str],
+        round_ts_ns: int
+    ) -> bool:
         """收集投资组合数据"""
         try:
-            portfolio_value = await exchange.get_portfolio_value()
+            async with self._api_sem:
+                portfolio_value = await exchange.get_portfolio_value()
             if portfolio_value and portfolio_value['total_value_usdt'] > 0:
-                await self.db_manager.write_portfolio_value(exchange_name, portfolio_value)
-                logger.debug(f"Collected portfolio value from {exchange_name}: ${portfolio_value['total_value_usdt']:.2f}")
+                self._round_portfolios[exchange_name] = portfolio_value
+                round_points.extend(self.db_manager.build_portfolio_points(exchange_name, portfolio_value, round_ts_ns))
+                logger.debug("Collected portfolio value from {}: ${:.2f}", exchange_name, portfolio_value['total_value_usdt'])
                 return True
             return False
             
@@ -244,26 +309,23 @@ class DataCollector:
             logger.error(f"Failed to collect portfolio data from {exchange_name}: {e}")
             return False
     
-    async def _collect_strategy_pnl(self):
+    def _collect_strategy_pnl(self, round_points: List[str], round_ts_ns: int):
         """收集策略PnL数据 - 简化版本，只收集各交易所总资金"""
         try:
-            current_time = datetime.now()
-            
-            # 收集每个交易所的总资金价值
-            for exchange_name, exchange in self.exchanges.items():
+            # 直接使用本轮_collect_portfolio_data已获取的总资金价值，不再重复请求交易所
+            for exchange_name, portfolio_value in self._round_portfolios.items():
                 try:
-                    portfolio_value = await exchange.get_portfolio_value()
+                    # 策略PnL数据点
+                    line = self.db_manager.build_strategy_pnl_point(
+                        exchange_name, 
+                        portfolio_value['total_value_usdt'],
+                        round_ts_ns
+                    )
+                    if line:
+                        round_points.append(line)
+                    
+                    logger.debug("Strategy PnL recorded for {}: ${:.2f}", exchange_name, portfolio_value['total_value_usdt'])
                     
-                    if portfolio_value and portfolio_value['total_value_usdt'] > 0:
-                        # 写入策略PnL数据点
-                        await self.db_manager.write_strategy_pnl(
-                            exchange_name, 
-                            portfolio_value['total_value_usdt'],
-                            current_time
-                        )
-                        
-                        logger.debug(f"Strategy PnL recorded for {exchange_name}: ${portfolio_value['total_value_usdt']:.2f}")
-                        
                 except Exception as e:
                     logger.error(f"Failed to collect strategy PnL for {exchange_name}: {e}")
                     continue
@@ -284,31 +346,41 @@ class DataCollector:
                 if self.running:
                     # 收集健康指标
                     health_metrics = {
-                        'collections_completed': self.stats['collections_completed'],
-                        'collections_failed': self.stats['collections_failed'],
+                        'collections_completed': self.stats.collections_completed,
+                        'collections_failed': self.stats.collections_failed,
                         'exchanges_active': len(self.exchanges),
-                        'total_runtime_seconds': self.stats['total_runtime'],
-                        'memory_usage_mb': await self._get_memory_usage(),
+                        'total_runtime_seconds': self.stats.total_runtime,
+                        'memory_usage_mb': self._get_memory_usage(),
                     }
                     
+                    # 只写入相对上次有变化的指标
+                    changed_metrics = {
+                        name: value
+                        for name, value in health_metrics.items()
+                        if name not in self._last_health
+                        or abs(value - self._last_health[name]) >= HEALTH_METRIC_EPSILON
+                    }
+                    
+                    if not changed_metrics:
+                        logger.debug("Health check: metrics unchanged, skipping write")
+                        continue
+                    
                     # 写入健康指标
-                    await self.db_manager.write_health_metrics(health_metrics)
+                    await self.db_manager.write_health_metrics(changed_metrics)
+                    self._last_health.update(changed_metrics)
                     
-                    logger.debug(f"Health check: {health_metrics}")
+                    logger.debug("Health check: {}", changed_metrics)
                     
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in health check: {e}")
     
-    async def _get_memory_usage(self) -> float:
+    def _get_memory_usage(self) -> float:
         """获取内存使用量（MB）"""
-        try:
-            import psutil
-            process = psutil.Process()
-            return process.memory_info().rss / 1024 / 1024
-        except ImportError:
+        if self._proc is None:
             return 0.0
+        return self._proc.memory_info().rss / (1 << 20)
     
     async def stop(self):
         """停止数据收集服务"""
@@ -324,9 +396,9 @@ class DataCollector:
                 logger.error(f"Error closing {exchange_name}: {e}")
         
         # 显示统计信息
-        runtime = self.stats['total_runtime']
-        completed = self.stats['collections_completed']
-        failed = self.stats['collections_failed']
+        runtime = self.stats.total_runtime
+        completed = self.stats.collections_completed
+        failed = self.stats.collections_failed
         
         logger.info(f"Data collection stopped. Runtime: {runtime:.0f}s, Completed: {completed}, Failed: {failed}")
     
@@ -335,7 +407,7 @@ class DataCollector:
         return {
             'running': self.running,
             'exchanges': list(self.exchanges.keys()),
-            'stats': self.stats.copy(),
+            'stats': asdict(self.stats),
             'config': {
                 'collection_interval': self.collection_interval,
                 'concurrent_requests': self.concurrent_requests,
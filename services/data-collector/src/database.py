@@ -3,43 +3,107 @@ InfluxDB数据库管理模块
 负责时序数据的存储和查询
 """
 
-import asyncio
-from datetime import datetime
+import math
+import numbers
+import time
+from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any, Optional
-from influxdb_client import InfluxDBClient, Point
-from influxdb_client.client.write_api import ASYNCHRONOUS
+from influxdb_client import WritePrecision
+from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
 from loguru import logger
 
 from .config import Config
 from .exchanges.base_exchange import Balance, Trade, MarketData
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# 行协议中tag键值需要转义的字符（与Point一致）
+_TAG_ESCAPES = str.maketrans({',': r'\,', '=': r'\=', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'})
+# 字符串字段值需要转义的字符
+_STRING_ESCAPES = str.maketrans({'"': r'\"', '\\': r'\\'})
+
+
+def _escape_tag(value: Any) -> str:
+    """转义行协议中的tag值，以反斜杠结尾时补空格，避免其转义后面的分隔符"""
+    escaped = str(value).translate(_TAG_ESCAPES)
+    if escaped.endswith('\\'):
+        escaped += ' '
+    return escaped
+
+
+def _tag_set(tags: Dict[str, Any]) -> str:
+    """按键排序拼接tag，跳过None和空值（InfluxDB拒绝空tag值），返回 ",k=v" 片段"""
+    return "".join(
+        f",{key}={escaped}"
+        for key, value in sorted(tags.items())
+        if value is not None and (escaped := _escape_tag(value))
+    )
+
+
+def _field_value(value: Any) -> Optional[str]:
+    """格式化行协议字段值，与Point一致：整数加i后缀、字符串加引号；None、非有限浮点数和不支持的类型返回None"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, numbers.Integral):
+        return f"{int(value)}i"
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        if not math.isfinite(value):
+            return None
+        return repr(value).removesuffix('.0')
+    if isinstance(value, str):
+        return f'"{value.translate(_STRING_ESCAPES)}"'
+    return None
+
+
+def _to_ns(timestamp: datetime) -> int:
+    """datetime转纳秒整数时间戳，无时区的datetime按UTC处理（与Point一致）"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (timestamp - _EPOCH) // _ONE_MICROSECOND * 1000
+
+
+def _line(measurement: str, tags: Dict[str, Any], fields: Dict[str, Any], timestamp_ns: int) -> Optional[str]:
+    """拼接一行行协议，tag与字段均按键排序（与Point一致）；无有效字段时返回None"""
+    field_set = ",".join(
+        f"{key}={formatted}"
+        for key, formatted in ((key, _field_value(value)) for key, value in sorted(fields.items()))
+        if formatted is not None
+    )
+    if not field_set:
+        return None
+    return f"{measurement}{_tag_set(tags)} {field_set} {timestamp_ns}"
+
 
 class InfluxDBManager:
     """InfluxDB数据库管理器"""
     
     def __init__(self, config: Config):
         self.config = config
-        self.client: Optional[InfluxDBClient] = None
+        self.client: Optional[InfluxDBClientAsync] = None
         self.write_api = None
         self.query_api = None
         
         # 数据库配置
-        self.url = self.config.get_influxdb_url()
-        self.token = self.config.get_influxdb_token()
-        self.org = self.config.get_influxdb_org()
-        self.bucket = self.config.get_influxdb_bucket()
+        self.url = self.config.influxdb_url
+        self.token = self.config.influxdb_token
+        self.org = self.config.influxdb_org
+        self.bucket = self.config.influxdb_bucket
         
     async def initialize(self) -> bool:
         """初始化数据库连接"""
         try:
-            self.client = InfluxDBClient(
+            self.client = InfluxDBClientAsync(
                 url=self.url,
                 token=self.token,
                 org=self.org
             )
             
-            # 创建异步写入API
-            self.write_api = self.client.write_api(write_options=ASYNCHRONOUS)
+            # 原生异步写入API，无需线程池中转
+            self.write_api = self.client.write_api()
             self.query_api = self.client.query_api()
             
             # 测试连接
@@ -57,189 +121,182 @@ class InfluxDBManager:
     async def test_connection(self) -> bool:
         """测试数据库连接"""
         try:
-            # 简单查询测试连接
-            query = f'from(bucket: "{self.bucket}") |> range(start: -1m) |> limit(n: 1)'
-            result = await asyncio.get_event_loop().run_in_executor(
-                None, self.query_api.query, query
-            )
-            logger.info("InfluxDB connection test successful")
-            return True
+            # 使用/ping端点测试连接，不触发存储层查询
+            if await self.client.ping():
+                logger.info("InfluxDB connection test successful")
+                return True
+            
+            logger.warning("InfluxDB ping failed")
+            return False
             
         except Exception as e:
             logger.warning(f"InfluxDB connection test failed: {e}")
-            # 连接测试失败不一定意味着数据库不可用，可能只是没有数据
-            return True
+            return False
     
     async def close(self):
         """关闭数据库连接"""
         if self.client:
-            self.client.close()
+            await self.client.close()
             logger.info("InfluxDB connection closed")
     
+    async def write_points(self, lines: List[str]):
+        """一次性写入一批行协议数据"""
+        try:
+            if lines:
+                await self.write_api.write(bucket=self.bucket, org=self.org, write_precision=WritePrecision.NS, record="\n".join(lines))
+                logger.info(f"Wrote {len(lines)} points to InfluxDB")
+                
+        except Exception as e:
+            logger.error(f"Failed to write points to InfluxDB: {e}")
+    
+    def build_balance_points(self, exchange_name: str, balances: List[Balance]) -> List[str]:
+        """构建账户余额数据点（行协议）"""
+        return [
+            line
+            for balance in balances
+            if (line := _line(
+                "account_balance",
+                {"asset": balance.asset, "exchange": exchange_name},
+                {"free": balance.free, "locked": balance.locked, "total": balance.total},
+                _to_ns(balance.timestamp)
+            ))
+        ]
+    
     async def write_balances(self, exchange_name: str, balances: List[Balance]):
         """写入账户余额数据"""
         try:
-            points = []
-            
-            for balance in balances:
-                point = (
-                    Point("account_balance")
-                    .tag("exchange", exchange_name)
-                    .tag("asset", balance.asset)
-                    .field("free", balance.free)
-                    .field("locked", balance.locked)
-                    .field("total", balance.total)
-                    .time(balance.timestamp)
-                )
-                points.append(point)
+            points = self.build_balance_points(exchange_name, balances)
             
             if points:
-                await asyncio.get_event_loop().run_in_executor(
-                    None, 
-                    self.write_api.write,
-                    self.bucket,
-                    self.org,
-                    points
-                )
+                await self.write_api.write(bucket=self.bucket, org=self.org, write_precision=WritePrecision.NS, record="\n".join(points))
                 logger.info(f"Wrote {len(points)} balance records for {exchange_name}")
                 
         except Exception as e:
             logger.error(f"Failed to write balances to InfluxDB: {e}")
     
+    def build_trade_points(self, exchange_name: str, trades: List[Trade]) -> List[str]:
+        """构建交易记录数据点（行协议）"""
+        return [
+            line
+            for trade in trades
+            if (line := _line(
+                "trades",
+                {"exchange": exchange_name, "side": trade.side, "symbol": trade.symbol, "trade_id": trade.trade_id},
+                {
+                    "amount": trade.amount,
+                    "price": trade.price,
+                    "value": trade.amount * trade.price,
+                    "fee": trade.fee,
+                    "fee_asset": trade.fee_asset,
+                },
+                _to_ns(trade.timestamp)
+            ))
+        ]
+    
     async def write_trades(self, exchange_name: str, trades: List[Trade]):
         """写入交易记录"""
         try:
-            points = []
-            
-            for trade in trades:
-                point = (
-                    Point("trades")
-                    .tag("exchange", exchange_name)
-                    .tag("symbol", trade.symbol)
-                    .tag("side", trade.side)
-                    .tag("trade_id", trade.trade_id)
-                    .field("amount", trade.amount)
-                    .field("price", trade.price)
-                    .field("value", trade.amount * trade.price)
-                    .field("fee", trade.fee)
-                    .field("fee_asset", trade.fee_asset)
-                    .time(trade.timestamp)
-                )
-                points.append(point)
+            points = self.build_trade_points(exchange_name, trades)
             
             if points:
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    self.write_api.write,
-                    self.bucket,
-                    self.org,
-                    points
-                )
+                await self.write_api.write(bucket=self.bucket, org=self.org, write_precision=WritePrecision.NS, record="\n".join(points))
                 logger.info(f"Wrote {len(points)} trade records for {exchange_name}")
                 
         except Exception as e:
             logger.error(f"Failed to write trades to InfluxDB: {e}")
     
+    def build_market_data_points(self, exchange_name: str, market_data: List[MarketData]) -> List[str]:
+        """构建市场数据点（行协议）"""
+        return [
+            line
+            for data in market_data
+            if (line := _line(
+                "market_data",
+                {"exchange": exchange_name, "symbol": data.symbol},
+                {
+                    "price": data.price,
+                    "volume_24h": data.volume_24h,
+                    "change_24h": data.change_24h,
+                    "change_24h_percent": data.change_24h_percent,
+                    "high_24h": data.high_24h,
+                    "low_24h": data.low_24h,
+                },
+                _to_ns(data.timestamp)
+            ))
+        ]
+    
     async def write_market_data(self, exchange_name: str, market_data: List[MarketData]):
         """写入市场数据"""
         try:
-            points = []
-            
-            for data in market_data:
-                point = (
-                    Point("market_data")
-                    .tag("exchange", exchange_name)
-                    .tag("symbol", data.symbol)
-                    .field("price", data.price)
-                    .field("volume_24h", data.volume_24h)
-                    .field("change_24h", data.change_24h)
-                    .field("change_24h_percent", data.change_24h_percent)
-                    .field("high_24h", data.high_24h)
-                    .field("low_24h", data.low_24h)
-                    .time(data.timestamp)
-                )
-                points.append(point)
+            points = self.build_market_data_points(exchange_name, market_data)
             
             if points:
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    self.write_api.write,
-                    self.bucket,
-                    self.org,
-                    points
-                )
+                await self.write_api.write(bucket=self.bucket, org=self.org, write_precision=WritePrecision.NS, record="\n".join(points))
                 logger.info(f"Wrote {len(points)} market data records for {exchange_name}")
                 
         except Exception as e:
             logger.error(f"Failed to write market data to InfluxDB: {e}")
     
-    async def write_portfolio_value(self, exchange_name: str, portfolio_data: Dict[str, Any]):
+    def build_portfolio_points(
+        self,
+        exchange_name: str,
+        portfolio_data: Dict[str, Any],
+        timestamp_ns: Optional[int] = None
+    ) -> List[str]:
+        """构建投资组合价值数据点（行协议），timestamp_ns为纳秒时间戳"""
+        current_time = timestamp_ns or time.time_ns()
+        
+        # 总价值
+        points = [_line(
+            "portfolio_value",
+            {"exchange": exchange_name, "type": "total"},
+            {"value_usdt": portfolio_data['total_value_usdt']},
+            current_time
+        )]
+        
+        # 各资产价值
+        for asset, data in portfolio_data.get('assets', {}).items():
+            points.append(_line(
+                "portfolio_value",
+                {"asset": asset, "exchange": exchange_name, "type": "asset"},
+                {"amount": data['amount'], "value_usdt": data['value_usdt'], "price": data['price']},
+                current_time
+            ))
+        
+        return [line for line in points if line]
+    
+    async def write_portfolio_value(
+        self,
+        exchange_name: str,
+        portfolio_data: Dict[str, Any],
+        timestamp: Optional[datetime] = None
+    ):
         """写入投资组合价值数据"""
         try:
-            current_time = datetime.now()
-            points = []
-            
-            # 写入总价值
-            total_point = (
-                Point("portfolio_value")
-                .tag("exchange", exchange_name)
-                .tag("type", "total")
-                .field("value_usdt", portfolio_data['total_value_usdt'])
-                .time(current_time)
+            points = self.build_portfolio_points(
+                exchange_name, portfolio_data, _to_ns(timestamp) if timestamp else None
             )
-            points.append(total_point)
-            
-            # 写入各资产价值
-            for asset, data in portfolio_data.get('assets', {}).items():
-                asset_point = (
-                    Point("portfolio_value")
-                    .tag("exchange", exchange_name)
-                    .tag("type", "asset")
-                    .tag("asset", asset)
-                    .field("amount", data['amount'])
-                    .field("value_usdt", data['value_usdt'])
-                    .field("price", data['price'])
-                    .time(current_time)
-                )
-                points.append(asset_point)
             
             if points:
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    self.write_api.write,
-                    self.bucket,
-                    self.org,
-                    points
-                )
+                await self.write_api.write(bucket=self.bucket, org=self.org, write_precision=WritePrecision.NS, record="\n".join(points))
                 logger.info(f"Wrote portfolio value data for {exchange_name}")
                 
         except Exception as e:
             logger.error(f"Failed to write portfolio value to InfluxDB: {e}")
     
-    async def write_health_metrics(self, metrics: Dict[str, Any]):
+    async def write_health_metrics(self, metrics: Dict[str, Any], timestamp: Optional[datetime] = None):
         """写入健康检查指标"""
         try:
-            current_time = datetime.now()
-            points = []
-            
-            for metric_name, value in metrics.items():
-                point = (
-                    Point("health_metrics")
-                    .tag("metric", metric_name)
-                    .field("value", value)
-                    .time(current_time)
-                )
-                points.append(point)
+            current_time = _to_ns(timestamp) if timestamp else time.time_ns()
+            points = [
+                line
+                for metric_name, value in metrics.items()
+                if (line := _line("health_metrics", {"metric": metric_name}, {"value": value}, current_time))
+            ]
             
             if points:
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    self.write_api.write,
-                    self.bucket,
-                    self.org,
-                    points
-                )
-                logger.debug(f"Wrote {len(points)} health metrics")
+                await self.write_api.write(bucket=self.bucket, org=self.org, write_precision=WritePrecision.NS, record="\n".join(points))
+                logger.debug("Wrote {} health metrics", len(points))
                 
         except Exception as e:
             logger.error(f"Failed to write health metrics to InfluxDB: {e}")
@@ -257,9 +314,7 @@ class InfluxDBManager:
               |> last()
             '''
             
-            tables = await asyncio.get_event_loop().run_in_executor(
-                None, self.query_api.query, query
-            )
+            tables = await self.query_api.query(query)
             
             for table in tables:
                 for record in table.records:
@@ -271,26 +326,24 @@ class InfluxDBManager:
             logger.error(f"Failed to get latest portfolio value: {e}")
             return None
     
+    def build_strategy_pnl_point(self, exchange_name: str, total_value_usdt: float, timestamp_ns: int) -> Optional[str]:
+        """构建策略PnL数据点（行协议），timestamp_ns为纳秒时间戳"""
+        return _line(
+            "strategy_pnl",
+            {"exchange": exchange_name, "strategy": "stablecoin_arbitrage"},  # 策略标识
+            {"total_value_usdt": total_value_usdt},
+            timestamp_ns
+        )
+    
     async def write_strategy_pnl(self, exchange_name: str, total_value_usdt: float, timestamp: datetime):
         """写入策略PnL数据点"""
         try:
-            point = (
-                Point("strategy_pnl")
-                .tag("exchange", exchange_name)
-                .tag("strategy", "stablecoin_arbitrage")  # 策略标识
-                .field("total_value_usdt", total_value_usdt)
-                .time(timestamp)
-            )
+            line = self.build_strategy_pnl_point(exchange_name, total_value_usdt, _to_ns(timestamp))
             
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.write_api.write,
-                self.bucket,
-                self.org,
-                [point]
-            )
+            if line:
+                await self.write_api.write(bucket=self.bucket, org=self.org, write_precision=WritePrecision.NS, record=line)
             
-            logger.debug(f"Wrote strategy PnL data for {exchange_name}: ${total_value_usdt:.2f}")
+            logger.debug("Wrote strategy PnL data for {}: ${:.2f}", exchange_name, total_value_usdt)
             
         except Exception as e:
             logger.error(f"Failed to write strategy PnL to InfluxDB: {e}")
\ No newline at end of file
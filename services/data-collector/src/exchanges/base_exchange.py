@@ -3,13 +3,20 @@
 定义所有交易所适配器的通用接口
 """
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Hashable
 from dataclasses import dataclass
 from datetime import datetime
 
+import numpy as np
 
-@dataclass
+from ..async_utils import TTLCache
+
+
+@dataclass(slots=True, frozen=True)
 class Balance:
     """账户余额数据结构"""
     asset: str
@@ -19,7 +26,7 @@ class Balance:
     timestamp: datetime
     
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
     """持仓数据结构"""
     symbol: str
@@ -32,7 +39,7 @@ class Position:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Trade:
     """交易记录数据结构"""
     symbol: str
@@ -45,7 +52,7 @@ class Trade:
     trade_id: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketData:
     """市场数据结构"""
     symbol: str
@@ -61,28 +68,50 @@ class MarketData:
 class BaseExchange(ABC):
     """交易所基类"""
     
+    # 行情与手续费缓存时间（秒）
+    MARKET_DATA_TTL = 2.0
+    TRADING_FEES_TTL = 3600.0
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.name = config.get("name", "Unknown")
-        self.api_key = config.get("api_key", "")
-        self.api_secret = config.get("api_secret", "")
-        self.sandbox = config.get("sandbox", False)
-        self.enabled = config.get("enabled", False)
-        self.symbols = config.get("symbols", [])
-        self.rate_limit = config.get("rate_limit", 100)
+        self.name: str = config.get("name", "Unknown")
+        self.api_key: str = config.get("api_key", "")
+        self.api_secret: str = config.get("api_secret", "")
+        self.sandbox: bool = config.get("sandbox", False)
+        self.enabled: bool = config.get("enabled", False)
+        self.symbols: List[str] = config.get("symbols", [])
+        self.rate_limit: int = config.get("rate_limit", 100)
+        
+        # 预先计算USDT交易对到基础资产的映射，兼容原始、大写和CCXT统一格式（BTCUSDT / btcusdt / BTC/USDT）
+        self._usdt_asset_map: Dict[str, str] = {}
+        for symbol in self.symbols:
+            compact = symbol.upper().replace('/', '')
+            if compact.endswith('USDT'):
+                asset = compact.removesuffix('USDT')
+                for key in (symbol, compact, f"{asset}/USDT"):
+                    self._usdt_asset_map[key] = asset
         
         # 内部状态
-        self._client = None
-        self._last_request_time = {}
+        self._client: Any = None
         self._request_count = 0
         
+        # 令牌桶限流：rate_limit为每分钟请求数，每次请求消耗1个令牌（服务端权重由各适配器按响应头另行控制）
+        self._bucket_capacity: float = float(self.rate_limit or 1)
+        self._refill_rate: float = self._bucket_capacity / 60.0
+        self._tokens: float = self._bucket_capacity
+        self._last_refill: float = time.monotonic()
+        self._bucket_lock = asyncio.Lock()
+        
+        # 接口结果TTL缓存，相同请求并发时共享结果
+        self._cache = TTLCache()
+        
     @abstractmethod
     async def initialize(self) -> bool:
         """初始化交易所连接"""
         pass
     
     @abstractmethod
-    async def close(self):
+    async def close(self) -> None:
         """关闭连接"""
         pass
     
@@ -111,44 +140,48 @@ class BaseExchange(ABC):
         """获取市场数据"""
         pass
     
-    async def get_portfolio_value(self) -> Dict[str, float]:
+    async def get_portfolio_value(self) -> Dict[str, Any]:
         """计算投资组合总价值"""
         try:
-            balances = await self.get_account_balance()
-            market_data = await self.get_market_data()
+            # 余额与行情互不依赖，并发获取
+            balances, market_data = await asyncio.gather(
+                self.get_account_balance(),
+                self.get_market_data()
+            )
             
             # 创建价格字典
-            prices = {}
-            for data in market_data:
-                symbol = data.symbol.upper()
-                if symbol.endswith('USDT'):
-                    asset = symbol.replace('USDT', '')
-                    prices[asset] = data.price
+            usdt_asset_map = self._usdt_asset_map
+            prices: Dict[str, float] = {
+                usdt_asset_map[data.symbol]: data.price
+                for data in market_data
+                if data.symbol in usdt_asset_map
+            }
             
-            # 计算总价值
-            total_value = 0.0
-            asset_values = {}
+            # 计算总价值：数量列与计价列逐元素相乘后求和（USDT按1计价）
+            held: List[Balance] = [balance for balance in balances if balance.total > 0]
+            assets: List[str] = [balance.asset.upper() for balance in held]
+            amounts: np.ndarray = np.fromiter((balance.total for balance in held), dtype=np.float64, count=len(held))
+            unit_prices: np.ndarray = np.fromiter(
+                (1.0 if asset == 'USDT' else prices.get(asset, 0.0) for asset in assets),
+                dtype=np.float64,
+                count=len(held)
+            )
+            values: np.ndarray = amounts * unit_prices
+            total_value: float = float(values.sum())
             
-            for balance in balances:
-                if balance.total > 0:
-                    asset = balance.asset.upper()
-                    if asset == 'USDT':
-                        value = balance.total
-                    elif asset in prices:
-                        value = balance.total * prices[asset]
-                    else:
-                        value = 0.0
-                    
-                    asset_values[asset] = {
-                        'amount': balance.total,
-                        'value_usdt': value,
-                        'price': prices.get(asset, 0.0)
-                    }
-                    total_value += value
+            asset_values: Dict[str, Dict[str, float]] = {
+                asset: {
+                    'amount': amount,
+                    'value_usdt': value,
+                    'price': prices.get(asset, 0.0)
+                }
+                for asset, amount, value in zip(assets, amounts.tolist(), values.tolist())
+            }
             
             return {
                 'total_value_usdt': total_value,
-                'assets': asset_values,
+                # 只读视图，下游无需复制
+                'assets': MappingProxyType(asset_values),
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -163,18 +196,38 @@ class BaseExchange(ABC):
         """获取要监控的交易对"""
         return self.symbols
     
-    async def rate_limit_check(self):
-        """速率限制检查"""
-        import time
-        import asyncio
-        
-        current_time = time.time()
+    async def _single_flight(self, key: Hashable, fetch_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """合并同一key的并发请求，只有第一个调用者实际发起请求
         
-        # 简单的速率限制实现
-        if hasattr(self, '_last_request_time'):
-            time_diff = current_time - self._last_request_time.get('last', 0)
-            if time_diff < (60.0 / self.rate_limit):  # 转换为每秒请求数
-                sleep_time = (60.0 / self.rate_limit) - time_diff
-                await asyncio.sleep(sleep_time)
+        如采集与投资组合计算同时查询余额时，只向交易所发出一次请求
+        """
+        return await self._cache.single_flight(key, fetch_fn)
+    
+    async def _cached(self, key: Hashable, ttl: float, fetch_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """带TTL的结果缓存，同一key的并发未命中只请求一次"""
+        return await self._cache.get(key, ttl, fetch_fn)
+    
+    async def acquire(self, weight: int = 1) -> None:
+        """从令牌桶获取指定权重的令牌，不足时等待补充
         
-        self._last_request_time['last'] = time.time()
\ No newline at end of file
+        锁保证令牌按顺序发放，并发请求不会读到同一状态后同时放行
+        """
+        async with self._bucket_lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._bucket_capacity,
+                self._tokens + (now - self._last_refill) * self._refill_rate
+            )
+            self._last_refill = now
+            
+            if self._tokens < weight:
+                await asyncio.sleep((weight - self._tokens) / self._refill_rate)
+                # 等待期间补充的令牌正好用于本次请求
+                self._tokens = 0.0
+                self._last_refill = time.monotonic()
+            else:
+                self._tokens -= weight
+    
+    async def rate_limit_check(self, weight: int = 1) -> None:
+        """速率限制检查"""
+        await self.acquire(weight)
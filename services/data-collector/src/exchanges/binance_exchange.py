@@ -3,26 +3,165 @@ Binance交易所适配器
 实现Binance现货交易API集成
 """
 
-import ccxt
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import asyncio
+import itertools
+import os
+import time
+from collections import deque
+from operator import neg
+from pathlib import Path
+import aiohttp
+import ccxt.async_support as ccxt
+import numpy as np
+import orjson
+from sortedcontainers import SortedDict
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta
 from loguru import logger
 
 from .base_exchange import BaseExchange, Balance, Position, Trade, MarketData
 
+# 成交记录的结构化数组类型（列式存储），排序截取后再转换为Trade
+TRADE_DTYPE = np.dtype([
+    ('symbol', 'U20'),
+    ('side', 'U4'),
+    ('amount', 'f8'),
+    ('price', 'f8'),
+    ('fee', 'f8'),
+    ('fee_asset', 'U10'),
+    ('timestamp', 'i8'),  # 毫秒
+    ('trade_id', 'U32'),
+])
+
+# 成交时间统一为UTC无时区datetime（与数据库写入时的处理一致）
+_EPOCH = datetime(1970, 1, 1)
+
+
+class LocalOrderBook:
+    """由REST快照和depth增量事件维护的本地订单簿"""
+    
+    def __init__(self):
+        self.bids: SortedDict = SortedDict(neg)  # 价格从高到低
+        self.asks: SortedDict = SortedDict()     # 价格从低到高
+        self.last_update_id = 0
+        self.timestamp: Optional[int] = None
+        self.synced = False
+        self._awaiting_first = False
+    
+    def load_snapshot(self, snapshot: Dict[str, Any]):
+        """用REST快照（CCXT格式，nonce为lastUpdateId）重建订单簿"""
+        self.bids.clear()
+        self.asks.clear()
+        self.bids.update((price, amount) for price, amount, *_ in snapshot['bids'])
+        self.asks.update((price, amount) for price, amount, *_ in snapshot['asks'])
+        self.last_update_id = snapshot['nonce']
+        self.timestamp = snapshot.get('timestamp')
+        self.synced = True
+        self._awaiting_first = True
+    
+    def apply_diff(self, event: Dict[str, Any]) -> bool:
+        """应用一条depthUpdate事件，序号不连续时返回False（需要重新同步）"""
+        first_id, final_id = event['U'], event['u']
+        if final_id <= self.last_update_id:
+            # 快照已包含的旧事件
+            return True
+        
+        if self._awaiting_first:
+            # 快照后的第一条事件须满足 U <= lastUpdateId+1 <= u
+            if first_id > self.last_update_id + 1:
+                return False
+            self._awaiting_first = False
+        elif first_id != self.last_update_id + 1:
+            return False
+        
+        for side, levels in ((self.bids, event['b']), (self.asks, event['a'])):
+            for price, amount in levels:
+                price, amount = float(price), float(amount)
+                if amount:
+                    side[price] = amount
+                else:
+                    side.pop(price, None)
+        
+        self.last_update_id = final_id
+        self.timestamp = event.get('E')
+        return True
+    
+    def top(self, symbol: str, limit: int) -> Dict[str, Any]:
+        """返回前limit档（CCXT订单簿格式）"""
+        return {
+            'symbol': symbol,
+            'bids': [[price, amount] for price, amount in itertools.islice(self.bids.items(), limit)],
+            'asks': [[price, amount] for price, amount in itertools.islice(self.asks.items(), limit)],
+            'timestamp': self.timestamp,
+            'datetime': None,
+            'nonce': self.last_update_id,
+        }
+
 
 class BinanceExchange(BaseExchange):
     """Binance交易所适配器"""
     
+    # fetch_my_trades并发上限（令牌桶按请求数计；myTrades服务端权重为20，12个并发约240，由已用权重响应头兜底）
+    TRADES_CONCURRENCY = 12
+    
+    # 已用权重超过该值时暂停到下一分钟窗口
+    USED_WEIGHT_HEADER = 'x-mbx-used-weight-1m'
+    USED_WEIGHT_BACKOFF_THRESHOLD = 1000
+    # 429/418未返回Retry-After时的默认暂停时间（秒）
+    DEFAULT_RETRY_AFTER = 60
+    
+    # 用户数据流（推送成交回报，替代轮询fetch_my_trades）
+    USER_STREAM_URL = "wss://stream.binance.com:9443/ws/{}"
+    LISTEN_KEY_KEEPALIVE = 30 * 60  # listenKey 60分钟过期，每30分钟续期
+    USER_STREAM_RECONNECT_DELAY = 5
+    USER_STREAM_MAX_BACKOFF = 300  # 连续失败时重连间隔指数增长的上限（秒）
+    TRADE_BUFFER_SIZE = 10000
+    
+    # 订单簿增量推送（本地维护订单簿，替代每次REST请求）
+    DEPTH_STREAM_URL = "wss://stream.binance.com:9443/ws/{}@depth@100ms"
+    DEPTH_SNAPSHOT_LIMIT = 1000
+    
+    # 市场元数据磁盘缓存（exchangeInfo约1MB，变化以小时计），目录可通过markets_cache_dir配置
+    MARKETS_CACHE_DIR = Path.home() / ".cache" / "scoa"
+    MARKETS_CACHE_TTL = 3600
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.exchange_id = 'binance'
+        # 容器内应指向挂载卷，否则缓存随容器重建丢失
+        self.markets_cache_dir = Path(config.get("markets_cache_dir") or self.MARKETS_CACHE_DIR).expanduser()
+        self._trades_sem = asyncio.Semaphore(self.TRADES_CONCURRENCY)
+        
+        # 服务端权重反馈：最近一次响应的已用权重，以及暂停请求直到的时间（time.time()）
+        self._used_weight = 0
+        self._paused_until = 0.0
+        
+        # 用户数据流状态
+        self._symbol_ids = frozenset(symbol.replace('/', '').upper() for symbol in self.symbols)
+        self._trade_buffer: deque = deque(maxlen=self.TRADE_BUFFER_SIZE)
+        self._trades_seeded = False
+        # 每次websocket建立连接后递增，用于判断REST补齐期间是否发生过重连
+        self._stream_generation = 0
+        self._stream_connected = False
+        self._listen_key: Optional[str] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._user_stream_tasks: List[asyncio.Task] = []
+        
+        # 本地订单簿：symbol -> 订单簿及其维护任务
+        self._order_books: Dict[str, LocalOrderBook] = {}
+        self._depth_tasks: Dict[str, asyncio.Task] = {}
         
     async def initialize(self) -> bool:
         """初始化Binance连接"""
         try:
+            # 长连接HTTP会话，REST请求与用户数据流复用连接，避免重复TCP/TLS握手
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, keepalive_timeout=60, ttl_dns_cache=300)
+            )
+            
             # 创建CCXT客户端
             self._client = ccxt.binance({
+                'session': self._session,
                 'apiKey': self.api_key,
                 'secret': self.api_secret,
                 'sandbox': self.sandbox,
@@ -33,29 +172,175 @@ class BinanceExchange(BaseExchange):
                 }
             })
             
+            await self._load_markets()
+            
             # 测试连接
             if await self.test_connection():
-                logger.info(f"Binance exchange initialized successfully")
+                logger.info("Binance exchange initialized successfully")
+                await self._start_user_stream()
                 return True
             else:
                 logger.error("Failed to connect to Binance")
-                return False
                 
         except Exception as e:
             logger.error(f"Failed to initialize Binance exchange: {e}")
-            return False
+        
+        # 初始化失败时调用方直接丢弃实例，需在此释放会话和连接池
+        await self.close()
+        return False
+    
+    async def _load_markets(self):
+        """加载市场元数据，缓存未过期时直接从磁盘恢复，跳过exchangeInfo请求"""
+        cache_path = self.markets_cache_dir / f"binance_markets{'_sandbox' if self.sandbox else ''}.json"
+        
+        try:
+            if time.time() - cache_path.stat().st_mtime < self.MARKETS_CACHE_TTL:
+                cached = orjson.loads(cache_path.read_bytes())
+                self._client.set_markets(cached['markets'], cached.get('currencies'))
+                logger.debug("Loaded Binance markets from cache {}", cache_path)
+                return
+        except Exception:
+            pass
+        
+        await self._client.load_markets()
+        
+        # 先写临时文件再替换，目录不可写时忽略
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{id(self)}.tmp")
+            tmp_path.write_bytes(orjson.dumps({
+                'markets': self._client.markets,
+                'currencies': self._client.currencies,
+            }))
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError) as e:
+            logger.debug("Could not write Binance markets cache {}: {}", cache_path, e)
     
     async def close(self):
         """关闭连接"""
-        if self._client:
-            self._client.close()
-            logger.info("Binance connection closed")
+        await self._stop_user_stream()
+        await self._stop_depth_streams()
+        try:
+            if self._client:
+                await self._client.close()
+                logger.info("Binance connection closed")
+        finally:
+            # 外部传入的会话CCXT不会关闭，需要自行关闭
+            if self._session:
+                await self._session.close()
+                self._session = None
+    
+    async def _start_user_stream(self):
+        """申请listenKey并启动用户数据流，失败时退回REST轮询"""
+        try:
+            response = await self._request(self._client.publicPostUserDataStream)
+            self._listen_key = response['listenKey']
+            self._user_stream_tasks = [
+                asyncio.create_task(self._user_stream_loop(), name="binance_user_stream"),
+                asyncio.create_task(self._keepalive_loop(), name="binance_listen_key_keepalive"),
+            ]
+            logger.info("Binance user data stream started")
+            
+        except Exception as e:
+            logger.warning(f"Failed to start Binance user data stream, falling back to REST polling: {e}")
+            await self._stop_user_stream()
+    
+    async def _stop_user_stream(self):
+        """停止用户数据流并释放listenKey"""
+        for task in self._user_stream_tasks:
+            task.cancel()
+        if self._user_stream_tasks:
+            await asyncio.gather(*self._user_stream_tasks, return_exceptions=True)
+        self._user_stream_tasks = []
+        
+        if self._listen_key:
+            try:
+                await self._client.publicDeleteUserDataStream({'listenKey': self._listen_key})
+            except Exception as e:
+                logger.debug("Failed to delete Binance listenKey: {}", e)
+            self._listen_key = None
+    
+    def _user_stream_active(self) -> bool:
+        """用户数据流是否已连接"""
+        return self._stream_connected and bool(self._user_stream_tasks) and not self._user_stream_tasks[0].done()
+    
+    async def _keepalive_loop(self):
+        """定期续期listenKey"""
+        while True:
+            await asyncio.sleep(self.LISTEN_KEY_KEEPALIVE)
+            try:
+                if self._listen_key:
+                    await self._request(self._client.publicPutUserDataStream, {'listenKey': self._listen_key})
+            except Exception as e:
+                logger.warning(f"Failed to keep Binance listenKey alive: {e}")
+    
+    async def _user_stream_loop(self):
+        """接收用户数据流事件，断线后按指数退避重连，listenKey过期时重新申请"""
+        failures = 0
+        while True:
+            try:
+                if self._listen_key is None:
+                    response = await self._request(self._client.publicPostUserDataStream)
+                    self._listen_key = response['listenKey']
+                
+                async with self._session.ws_connect(
+                    self.USER_STREAM_URL.format(self._listen_key), heartbeat=60
+                ) as ws:
+                    # 连接建立后才要求重新补齐：断线期间的成交由下一次REST请求补上
+                    self._stream_generation += 1
+                    self._trades_seeded = False
+                    self._stream_connected = True
+                    failures = 0
+                    
+                    try:
+                        async for msg in ws:
+                            if msg.type != aiohttp.WSMsgType.TEXT:
+                                break
+                            event = orjson.loads(msg.data)
+                            event_type = event.get('e')
+                            if event_type == 'executionReport':
+                                self._on_execution_report(event)
+                            elif event_type == 'listenKeyExpired':
+                                logger.warning("Binance listenKey expired, requesting a new one")
+                                self._listen_key = None
+                                break
+                    finally:
+                        # 断线期间改用REST获取成交
+                        self._stream_connected = False
+                
+                logger.warning("Binance user data stream disconnected, reconnecting")
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                # 重新申请listenKey：原key仍有效时Binance返回同一个key并续期，已失效时换新key
+                self._listen_key = None
+                logger.warning(f"Binance user data stream error: {e}")
+            
+            await asyncio.sleep(min(self.USER_STREAM_RECONNECT_DELAY * 2 ** failures, self.USER_STREAM_MAX_BACKOFF))
+    
+    def _on_execution_report(self, event: Dict[str, Any]):
+        """将成交回报转换为Trade并放入缓冲区"""
+        if event.get('x') != 'TRADE' or event.get('s') not in self._symbol_ids:
+            return
+        
+        self._trade_buffer.append(Trade(
+            symbol=self._client.safe_symbol(event['s']),
+            side=event['S'].lower(),
+            amount=float(event['l']),
+            price=float(event['L']),
+            fee=float(event.get('n') or 0.0),
+            fee_asset=event.get('N') or '',
+            timestamp=_EPOCH + timedelta(milliseconds=event['T']),
+            trade_id=str(event['t'])
+        ))
     
     async def test_connection(self) -> bool:
         """测试API连接"""
         try:
             # 使用简单的市场数据API测试连接
-            response = self._client.fetch_ticker('BTCUSDT')
+            response = await self._client.fetch_ticker('BTCUSDT')
             return 'symbol' in response and response['symbol'] == 'BTC/USDT'
             
         except Exception as e:
@@ -65,8 +350,7 @@ class BinanceExchange(BaseExchange):
     async def get_account_balance(self) -> List[Balance]:
         """获取账户余额"""
         try:
-            await self.rate_limit_check()
-            balance_data = self._client.fetch_balance()
+            balance_data = await self._single_flight('balance', self._fetch_balance)
             
             balances = []
             current_time = datetime.now()
@@ -85,107 +369,294 @@ class BinanceExchange(BaseExchange):
                     )
                     balances.append(balance)
             
-            logger.info(f"Retrieved {len(balances)} non-zero balances from Binance")
+            logger.debug("Retrieved {} non-zero balances from Binance", len(balances))
             return balances
             
         except Exception as e:
             logger.error(f"Failed to get Binance account balance: {e}")
             return []
     
+    async def _fetch_balance(self) -> Dict[str, Any]:
+        """请求账户余额"""
+        return await self._request(self._client.fetch_balance)
+    
     async def get_positions(self) -> List[Position]:
         """获取持仓信息（现货交易返回空列表）"""
         return []
     
     async def get_recent_trades(self, limit: int = 100) -> List[Trade]:
-        """获取最近交易记录"""
+        """获取最近交易记录
+        
+        用户数据流运行时直接读取推送缓冲区；连接建立后首次调用先用REST补齐历史成交
+        """
+        if self._user_stream_active() and self._trades_seeded:
+            recent = list(itertools.islice(reversed(self._trade_buffer), limit))
+            logger.debug("Retrieved {} recent trades from Binance user data stream", len(recent))
+            return recent
+        
+        generation = self._stream_generation
+        trades, complete = await self._fetch_recent_trades_rest(limit)
+        # 部分交易对请求失败或请求期间发生重连时历史不完整，下次继续走REST补齐；无成交也视为已补齐
+        if complete and self._user_stream_active() and generation == self._stream_generation:
+            self._merge_into_buffer(trades)
+            self._trades_seeded = True
+        return trades
+    
+    def _merge_into_buffer(self, trades: List[Trade]):
+        """将REST成交并入推送缓冲区，保留请求期间推送到达的成交，按成交ID去重并按时间正序排列"""
+        merged = {(trade.symbol, trade.trade_id): trade for trade in trades}
+        for trade in self._trade_buffer:
+            merged[(trade.symbol, trade.trade_id)] = trade
+        
+        self._trade_buffer.clear()
+        self._trade_buffer.extend(sorted(merged.values(), key=lambda trade: trade.timestamp))
+    
+    async def _fetch_recent_trades_rest(self, limit: int) -> Tuple[List[Trade], bool]:
+        """通过REST接口获取最近交易记录，返回(交易记录, 是否所有交易对都获取成功)"""
         try:
-            await self.rate_limit_check()
+            # 并发获取每个监控交易对的交易记录，信号量限制同时在途的请求数
+            results = await asyncio.gather(
+                *(self._fetch_my_trades(symbol, limit) for symbol in self.symbols),
+                return_exceptions=True
+            )
             
-            all_trades = []
+            complete = True
+            for symbol, result in zip(self.symbols, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to get trades for {symbol}: {result}")
+                    complete = False
             
-            # 对每个监控的交易对获取交易记录
-            for symbol in self.symbols:
-                try:
-                    trades_data = self._client.fetch_my_trades(symbol, limit=limit)
-                    
-                    for trade_data in trades_data:
-                        trade = Trade(
-                            symbol=trade_data['symbol'],
-                            side=trade_data['side'],
-                            amount=float(trade_data['amount']),
-                            price=float(trade_data['price']),
-                            fee=float(trade_data.get('fee', {}).get('cost', 0.0)),
-                            fee_asset=trade_data.get('fee', {}).get('currency', ''),
-                            timestamp=datetime.fromtimestamp(trade_data['timestamp'] / 1000),
-                            trade_id=str(trade_data['id'])
-                        )
-                        all_trades.append(trade)
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to get trades for {symbol}: {e}")
-                    continue
+            flat = list(itertools.chain.from_iterable(
+                result for result in results if not isinstance(result, Exception)
+            ))
             
-            # 按时间排序
-            all_trades.sort(key=lambda x: x.timestamp, reverse=True)
+            trades = np.fromiter(
+                (
+                    (
+                        trade_data['symbol'],
+                        trade_data['side'],
+                        trade_data['amount'],
+                        trade_data['price'],
+                        (trade_data.get('fee') or {}).get('cost') or 0.0,
+                        (trade_data.get('fee') or {}).get('currency') or '',
+                        trade_data['timestamp'],
+                        str(trade_data['id']),
+                    )
+                    for trade_data in flat
+                ),
+                dtype=TRADE_DTYPE,
+                count=len(flat)
+            )
+            
+            # 按时间倒序排序，只为截取后的记录创建Trade对象
+            recent = trades[np.argsort(trades['timestamp'], kind='stable')[::-1][:limit]]
+            
+            # 毫秒时间戳整列转换为datetime，避免逐条调用fromtimestamp
+            timestamps = recent['timestamp'].astype('datetime64[ms]').tolist()
             
-            logger.info(f"Retrieved {len(all_trades)} recent trades from Binance")
-            return all_trades[:limit]
+            logger.debug("Retrieved {} recent trades from Binance", len(trades))
+            return [
+                Trade(
+                    symbol=symbol,
+                    side=side,
+                    amount=amount,
+                    price=price,
+                    fee=fee,
+                    fee_asset=fee_asset,
+                    timestamp=timestamp,
+                    trade_id=trade_id
+                )
+                for (symbol, side, amount, price, fee, fee_asset, _, trade_id), timestamp
+                in zip(recent.tolist(), timestamps)
+            ], complete
             
         except Exception as e:
             logger.error(f"Failed to get Binance recent trades: {e}")
-            return []
+            return [], False
+    
+    async def _fetch_my_trades(self, symbol: str, limit: int) -> List[Dict[str, Any]]:
+        """在并发上限内获取单个交易对的交易记录"""
+        async with self._trades_sem:
+            return await self._request(self._client.fetch_my_trades, symbol, limit=limit)
+    
+    def _response_header(self, name: str) -> Optional[str]:
+        """读取最近一次响应头中的指定字段（不区分大小写）"""
+        headers = self._client.last_response_headers or {}
+        for key, value in headers.items():
+            if key.lower() == name:
+                return value
+        return None
+    
+    async def _request(self, fetch_fn, *args, **kwargs) -> Any:
+        """限流后执行CCXT请求，记录服务端返回的已用权重，触发429/418时按Retry-After暂停"""
+        await self.rate_limit_check()
+        try:
+            return await fetch_fn(*args, **kwargs)
+        except ccxt.DDoSProtection:
+            retry_after = self._response_header('retry-after')
+            try:
+                pause = float(retry_after) if retry_after else self.DEFAULT_RETRY_AFTER
+            except ValueError:
+                pause = self.DEFAULT_RETRY_AFTER
+            self._paused_until = max(self._paused_until, time.time() + pause)
+            logger.warning(f"Binance rate limit hit, pausing requests for {pause:.0f}s")
+            raise
+        finally:
+            used_weight = self._response_header(self.USED_WEIGHT_HEADER)
+            if used_weight and used_weight.isdigit():
+                self._used_weight = int(used_weight)
+    
+    async def acquire(self, weight: int = 1) -> None:
+        """在令牌桶之外参考服务端反馈：已用权重接近上限时等到下一分钟窗口，被限流时等到Retry-After结束"""
+        if self._used_weight > self.USED_WEIGHT_BACKOFF_THRESHOLD:
+            now = time.time()
+            self._paused_until = max(self._paused_until, now + 60 - now % 60)
+            logger.warning(f"Binance used weight {self._used_weight}, backing off until next minute window")
+            self._used_weight = 0
+        
+        pause = self._paused_until - time.time()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        
+        await super().acquire(weight)
     
     async def get_market_data(self, symbols: Optional[List[str]] = None) -> List[MarketData]:
         """获取市场数据"""
         try:
-            await self.rate_limit_check()
-            
             target_symbols = symbols or self.symbols
+            if not target_symbols:
+                return []
+            
             market_data_list = []
             current_time = datetime.now()
             
-            # 获取24小时统计数据
-            tickers = self._client.fetch_tickers(target_symbols)
+            # 获取24小时统计数据，短时间内的重复调用复用缓存
+            tickers = await self._cached(
+                ('tickers', tuple(sorted(target_symbols))),
+                self.MARKET_DATA_TTL,
+                lambda: self._fetch_tickers(target_symbols)
+            )
             
+            # fetch_tickers只返回请求的交易对，无需再检查成员关系；
+            # 配置中的交易对ID（FDUSDUSDT）与返回的统一符号（FDUSD/USDT）格式不同，逐个比对会把结果全部过滤掉
             for symbol, ticker in tickers.items():
-                if symbol in target_symbols:
-                    market_data = MarketData(
-                        symbol=symbol,
-                        price=float(ticker['last']),
-                        volume_24h=float(ticker['baseVolume']),
-                        change_24h=float(ticker['change']) if ticker['change'] else 0.0,
-                        change_24h_percent=float(ticker['percentage']) if ticker['percentage'] else 0.0,
-                        high_24h=float(ticker['high']),
-                        low_24h=float(ticker['low']),
-                        timestamp=current_time
-                    )
-                    market_data_list.append(market_data)
+                market_data = MarketData(
+                    symbol=symbol,
+                    price=float(ticker['last']),
+                    volume_24h=float(ticker['baseVolume']),
+                    change_24h=float(ticker['change']) if ticker['change'] else 0.0,
+                    change_24h_percent=float(ticker['percentage']) if ticker['percentage'] else 0.0,
+                    high_24h=float(ticker['high']),
+                    low_24h=float(ticker['low']),
+                    timestamp=current_time
+                )
+                market_data_list.append(market_data)
             
-            logger.info(f"Retrieved market data for {len(market_data_list)} symbols from Binance")
+            logger.debug("Retrieved market data for {} symbols from Binance", len(market_data_list))
             return market_data_list
             
         except Exception as e:
             logger.error(f"Failed to get Binance market data: {e}")
             return []
     
+    async def _fetch_tickers(self, symbols: List[str]) -> Dict[str, Any]:
+        """请求行情数据"""
+        return await self._request(self._client.fetch_tickers, symbols)
+    
+    async def _fetch_trading_fees(self) -> Dict[str, Any]:
+        """请求交易手续费"""
+        return await self._request(self._client.fetch_trading_fees)
+    
     async def get_trading_fees(self) -> Dict[str, Any]:
-        """获取交易手续费"""
+        """获取交易手续费（变化很少，按小时缓存）"""
         try:
-            await self.rate_limit_check()
-            fees = self._client.fetch_trading_fees()
-            return fees
+            return await self._cached('trading_fees', self.TRADING_FEES_TTL, self._fetch_trading_fees)
             
         except Exception as e:
             logger.error(f"Failed to get Binance trading fees: {e}")
             return {}
     
     async def get_order_book(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
-        """获取订单簿"""
+        """获取订单簿
+        
+        首次调用时为该交易对启动depth增量推送，本地订单簿同步后直接从内存返回；未同步前使用REST
+        """
         try:
-            await self.rate_limit_check()
-            order_book = self._client.fetch_order_book(symbol, limit)
-            return order_book
+            book = self._order_books.get(symbol)
+            if book is None:
+                book = self._order_books[symbol] = LocalOrderBook()
+                self._depth_tasks[symbol] = asyncio.create_task(
+                    self._depth_stream_loop(symbol, book), name=f"binance_depth_{symbol}"
+                )
+            
+            if book.synced:
+                order_book = book.top(symbol, limit)
+                order_book['datetime'] = self._client.iso8601(order_book['timestamp'])
+                return order_book
+            
+            return await self._request(self._client.fetch_order_book, symbol, limit)
             
         except Exception as e:
             logger.error(f"Failed to get Binance order book for {symbol}: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    async def _depth_stream_loop(self, symbol: str, book: LocalOrderBook):
+        """接收depth增量事件维护本地订单簿，断线或序号不连续时重新同步"""
+        try:
+            url = self.DEPTH_STREAM_URL.format(self._client.market_id(symbol).lower())
+        except Exception as e:
+            # 未知交易对无法订阅，订单簿保持未同步，get_order_book继续使用REST
+            logger.error(f"Failed to start Binance depth stream for {symbol}: {e}")
+            return
+        
+        while True:
+            book.synced = False
+            snapshot_task: Optional[asyncio.Task] = None
+            try:
+                async with self._session.ws_connect(url, heartbeat=60) as ws:
+                    # 先订阅并缓存事件，再获取快照，保证快照之后的事件不丢失
+                    pending: List[Dict[str, Any]] = []
+                    snapshot_task = asyncio.create_task(
+                        self._request(self._client.fetch_order_book, symbol, self.DEPTH_SNAPSHOT_LIMIT)
+                    )
+                    
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        event = orjson.loads(msg.data)
+                        
+                        if book.synced:
+                            if not book.apply_diff(event):
+                                logger.warning(f"Binance {symbol} depth stream out of sequence, resyncing")
+                                break
+                            continue
+                        
+                        pending.append(event)
+                        if not snapshot_task.done():
+                            continue
+                        
+                        book.load_snapshot(snapshot_task.result())
+                        if not all(book.apply_diff(buffered) for buffered in pending):
+                            logger.warning(f"Binance {symbol} depth snapshot is stale, resyncing")
+                            break
+                        pending.clear()
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Binance {symbol} depth stream error: {e}")
+            finally:
+                if snapshot_task and not snapshot_task.done():
+                    snapshot_task.cancel()
+            
+            book.synced = False
+            await asyncio.sleep(self.USER_STREAM_RECONNECT_DELAY)
+    
+    async def _stop_depth_streams(self):
+        """停止所有订单簿推送"""
+        for task in self._depth_tasks.values():
+            task.cancel()
+        if self._depth_tasks:
+            await asyncio.gather(*self._depth_tasks.values(), return_exceptions=True)
+        self._depth_tasks.clear()
+        self._order_books.clear()
@@ -1,8 +1,11 @@
 """
 HTX (Huobi) 交易所适配器
 实现HTX现货交易API集成
+
+仍使用同步CCXT客户端，阻塞请求通过asyncio.to_thread放到线程池执行，避免阻塞事件循环
 """
 
+import asyncio
 import ccxt
 from typing import Dict, List, Any, Optional
 from datetime import datetime
@@ -14,9 +17,13 @@ from .base_exchange import BaseExchange, Balance, Position, Trade, MarketData
 class HTXExchange(BaseExchange):
     """HTX (Huobi) 交易所适配器"""
     
+    # fetch_my_trades并发上限（同步CCXT客户端的限速状态非线程安全，只允许少量线程同时使用）
+    TRADES_CONCURRENCY = 4
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.exchange_id = 'huobi'  # CCXT中使用huobi
+        self._trades_sem = asyncio.Semaphore(self.TRADES_CONCURRENCY)
         
     async def initialize(self) -> bool:
         """初始化HTX连接"""
@@ -55,7 +62,7 @@ class HTXExchange(BaseExchange):
         """测试API连接"""
         try:
             # 使用简单的市场数据API测试连接
-            response = self._client.fetch_ticker('BTC/USDT')
+            response = await asyncio.to_thread(self._client.fetch_ticker, 'BTC/USDT')
             return 'symbol' in response and 'BTC/USDT' in response['symbol']
             
         except Exception as e:
@@ -65,8 +72,7 @@ class HTXExchange(BaseExchange):
     async def get_account_balance(self) -> List[Balance]:
         """获取账户余额"""
         try:
-            await self.rate_limit_check()
-            balance_data = self._client.fetch_balance()
+            balance_data = await self._single_flight('balance', self._fetch_balance)
             
             balances = []
             current_time = datetime.now()
@@ -92,6 +98,11 @@ class HTXExchange(BaseExchange):
             logger.error(f"Failed to get HTX account balance: {e}")
             return []
     
+    async def _fetch_balance(self) -> Dict[str, Any]:
+        """请求账户余额"""
+        await self.rate_limit_check()
+        return await asyncio.to_thread(self._client.fetch_balance)
+    
     async def get_positions(self) -> List[Position]:
         """获取持仓信息（现货交易返回空列表）"""
         return []
@@ -99,32 +110,31 @@ class HTXExchange(BaseExchange):
     async def get_recent_trades(self, limit: int = 100) -> List[Trade]:
         """获取最近交易记录"""
         try:
-            await self.rate_limit_check()
-            
             all_trades = []
             
-            # 对每个监控的交易对获取交易记录
-            for symbol in self.symbols:
-                try:
-                    # HTX的symbol格式通常是小写，如btcusdt
-                    trades_data = self._client.fetch_my_trades(symbol, limit=limit)
-                    
-                    for trade_data in trades_data:
-                        trade = Trade(
-                            symbol=trade_data['symbol'],
-                            side=trade_data['side'],
-                            amount=float(trade_data['amount']),
-                            price=float(trade_data['price']),
-                            fee=float(trade_data.get('fee', {}).get('cost', 0.0)),
-                            fee_asset=trade_data.get('fee', {}).get('currency', ''),
-                            timestamp=datetime.fromtimestamp(trade_data['timestamp'] / 1000),
-                            trade_id=str(trade_data['id'])
-                        )
-                        all_trades.append(trade)
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to get HTX trades for {symbol}: {e}")
+            # 各交易对在线程池中并发获取交易记录（HTX的symbol格式通常是小写，如btcusdt）
+            results = await asyncio.gather(
+                *(self._fetch_my_trades(symbol, limit) for symbol in self.symbols),
+                return_exceptions=True
+            )
+            
+            for symbol, trades_data in zip(self.symbols, results):
+                if isinstance(trades_data, Exception):
+                    logger.warning(f"Failed to get HTX trades for {symbol}: {trades_data}")
                     continue
+                
+                for trade_data in trades_data:
+                    trade = Trade(
+                        symbol=trade_data['symbol'],
+                        side=trade_data['side'],
+                        amount=float(trade_data['amount']),
+                        price=float(trade_data['price']),
+                        fee=float(trade_data.get('fee', {}).get('cost', 0.0)),
+                        fee_asset=trade_data.get('fee', {}).get('currency', ''),
+                        timestamp=datetime.fromtimestamp(trade_data['timestamp'] / 1000),
+                        trade_id=str(trade_data['id'])
+                    )
+                    all_trades.append(trade)
             
             # 按时间排序
             all_trades.sort(key=lambda x: x.timestamp, reverse=True)
@@ -136,36 +146,47 @@ class HTXExchange(BaseExchange):
             logger.error(f"Failed to get HTX recent trades: {e}")
             return []
     
+    async def _fetch_my_trades(self, symbol: str, limit: int) -> List[Dict[str, Any]]:
+        """在并发上限内获取单个交易对的交易记录，每个请求单独计入限流"""
+        async with self._trades_sem:
+            await self.rate_limit_check()
+            return await asyncio.to_thread(self._client.fetch_my_trades, symbol, limit=limit)
+    
     async def get_market_data(self, symbols: Optional[List[str]] = None) -> List[MarketData]:
         """获取市场数据"""
         try:
-            await self.rate_limit_check()
-            
             target_symbols = symbols or self.symbols
+            if not target_symbols:
+                return []
+            
             market_data_list = []
             current_time = datetime.now()
             
-            # 获取24小时统计数据
-            tickers = self._client.fetch_tickers(target_symbols)
+            # 获取24小时统计数据，短时间内的重复调用复用缓存
+            tickers = await self._cached(
+                ('tickers', tuple(sorted(target_symbols))),
+                self.MARKET_DATA_TTL,
+                lambda: self._fetch_tickers(target_symbols)
+            )
             
+            # 结果已按请求的交易对过滤（配置ID与统一符号格式不同，不能逐个比对）
             for symbol, ticker in tickers.items():
-                if symbol in target_symbols:
-                    # 确保数据存在且有效
-                    last_price = ticker.get('last', 0)
-                    if last_price is None:
-                        last_price = ticker.get('close', 0)
-                    
-                    market_data = MarketData(
-                        symbol=symbol,
-                        price=float(last_price) if last_price else 0.0,
-                        volume_24h=float(ticker.get('baseVolume', 0)) if ticker.get('baseVolume') else 0.0,
-                        change_24h=float(ticker.get('change', 0)) if ticker.get('change') else 0.0,
-                        change_24h_percent=float(ticker.get('percentage', 0)) if ticker.get('percentage') else 0.0,
-                        high_24h=float(ticker.get('high', 0)) if ticker.get('high') else 0.0,
-                        low_24h=float(ticker.get('low', 0)) if ticker.get('low') else 0.0,
-                        timestamp=current_time
-                    )
-                    market_data_list.append(market_data)
+                # 确保数据存在且有效
+                last_price = ticker.get('last', 0)
+                if last_price is None:
+                    last_price = ticker.get('close', 0)
+                
+                market_data = MarketData(
+                    symbol=symbol,
+                    price=float(last_price) if last_price else 0.0,
+                    volume_24h=float(ticker.get('baseVolume', 0)) if ticker.get('baseVolume') else 0.0,
+                    change_24h=float(ticker.get('change', 0)) if ticker.get('change') else 0.0,
+                    change_24h_percent=float(ticker.get('percentage', 0)) if ticker.get('percentage') else 0.0,
+                    high_24h=float(ticker.get('high', 0)) if ticker.get('high') else 0.0,
+                    low_24h=float(ticker.get('low', 0)) if ticker.get('low') else 0.0,
+                    timestamp=current_time
+                )
+                market_data_list.append(market_data)
             
             logger.info(f"Retrieved market data for {len(market_data_list)} symbols from HTX")
             return market_data_list
@@ -174,12 +195,20 @@ class HTXExchange(BaseExchange):
             logger.error(f"Failed to get HTX market data: {e}")
             return []
     
+    async def _fetch_tickers(self, symbols: List[str]) -> Dict[str, Any]:
+        """请求行情数据"""
+        await self.rate_limit_check()
+        return await asyncio.to_thread(self._client.fetch_tickers, symbols)
+    
+    async def _fetch_trading_fees(self) -> Dict[str, Any]:
+        """请求交易手续费"""
+        await self.rate_limit_check()
+        return await asyncio.to_thread(self._client.fetch_trading_fees)
+    
     async def get_trading_fees(self) -> Dict[str, Any]:
-        """获取交易手续费"""
+        """获取交易手续费（变化很少，按小时缓存）"""
         try:
-            await self.rate_limit_check()
-            fees = self._client.fetch_trading_fees()
-            return fees
+            return await self._cached('trading_fees', self.TRADING_FEES_TTL, self._fetch_trading_fees)
             
         except Exception as e:
             logger.error(f"Failed to get HTX trading fees: {e}")
@@ -189,7 +218,7 @@ class HTXExchange(BaseExchange):
         """获取订单簿"""
         try:
             await self.rate_limit_check()
-            order_book = self._client.fetch_order_book(symbol, limit)
+            order_book = await asyncio.to_thread(self._client.fetch_order_book, symbol, limit)
             return order_book
             
         except Exception as e:
@@ -0,0 +1,117 @@
+"""
+行协议构建测试
+逐条对比InfluxDBManager各构建方法与influxdb_client.Point的输出
+"""
+
+from datetime import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+influxdb_client = pytest.importorskip("influxdb_client")
+pytest.importorskip("loguru")
+
+from influxdb_client import Point, WritePrecision
+
+from src.database import InfluxDBManager, _to_ns
+from src.exchanges.base_exchange import Balance, MarketData, Trade
+
+
+TIMESTAMP = datetime(2024, 1, 2, 3, 4, 5, 678901)
+
+
+@pytest.fixture
+def manager():
+    # 构建方法不依赖连接配置，跳过__init__
+    return InfluxDBManager.__new__(InfluxDBManager)
+
+
+def _point_line(measurement, tags, fields, timestamp_ns):
+    point = Point(measurement)
+    for key, value in tags.items():
+        point.tag(key, value)
+    for key, value in fields.items():
+        point.field(key, value)
+    return point.time(timestamp_ns, WritePrecision.NS).to_line_protocol() or None
+
+
+@pytest.mark.parametrize("side, trade_id", [
+    ("buy", "123"),
+    ("", ""),  # 空tag值应省略
+    ("sell", "id with space,comma=eq"),
+    ("buy", "trailing\\"),  # 结尾反斜杠
+])
+def test_trade_points_match_point(manager, side, trade_id):
+    trade = Trade(
+        symbol="BTC/USDT",
+        side=side,
+        amount=np.float64(0.5),
+        price=np.float64(42000.0),
+        fee=0.0,
+        fee_asset='BN"B\\',
+        timestamp=TIMESTAMP,
+        trade_id=trade_id,
+    )
+    
+    expected = _point_line(
+        "trades",
+        {"exchange": "binance", "side": side, "symbol": trade.symbol, "trade_id": trade_id},
+        {
+            "amount": trade.amount,
+            "price": trade.price,
+            "value": trade.amount * trade.price,
+            "fee": trade.fee,
+            "fee_asset": trade.fee_asset,
+        },
+        _to_ns(TIMESTAMP),
+    )
+    
+    assert manager.build_trade_points("binance", [trade]) == [expected]
+
+
+def test_balance_points_match_point(manager):
+    balance = Balance(asset="USDT", free=np.int64(3), locked=1.0, total=float("nan"), timestamp=TIMESTAMP)
+    
+    expected = _point_line(
+        "account_balance",
+        {"asset": "USDT", "exchange": "htx"},
+        {"free": balance.free, "locked": balance.locked, "total": balance.total},
+        _to_ns(TIMESTAMP),
+    )
+    
+    assert manager.build_balance_points("htx", [balance]) == [expected]
+
+
+def test_market_data_points_skip_none_fields(manager):
+    data = MarketData(
+        symbol="ETH/USDT",
+        price=3000.25,
+        volume_24h=None,
+        change_24h=np.float64(-1.5),
+        change_24h_percent=None,
+        high_24h=3100.0,
+        low_24h=2900.0,
+        timestamp=TIMESTAMP,
+    )
+    
+    expected = _point_line(
+        "market_data",
+        {"exchange": "binance", "symbol": "ETH/USDT"},
+        {
+            "price": data.price,
+            "volume_24h": data.volume_24h,
+            "change_24h": data.change_24h,
+            "change_24h_percent": data.change_24h_percent,
+            "high_24h": data.high_24h,
+            "low_24h": data.low_24h,
+        },
+        _to_ns(TIMESTAMP),
+    )
+    
+    lines = manager.build_market_data_points("binance", [data])
+    assert lines == [expected]
+    assert "None" not in lines[0]
+
+
+def test_strategy_pnl_without_finite_value_is_dropped(manager):
+    assert manager.build_strategy_pnl_point("binance", float("inf"), 1) is None